@@ -0,0 +1,131 @@
+from array import array
+
+from qgis.core import QgsFeatureRequest, QgsMessageLog, QgsRectangle, QgsTask, QgsVectorLayerFeatureSource, Qgis
+
+try:
+    import numpy
+except ImportError:  # The cache is optional: without NumPy zooms read the geometries
+    numpy = None
+
+
+def bbox_cache_available():
+    return numpy is not None
+
+
+class BBoxCache:
+    """Bounding boxes of every feature of one layer in layer CRS, as NumPy arrays sorted by feature id.
+
+    The cache stops answering as soon as the layer reports a change to its
+    features or geometries.
+    """
+
+    def __init__(self, layer, feature_ids, boxes):
+        self.layer = layer
+        self.feature_ids = feature_ids  # int64, ascending
+        self.boxes = boxes  # float64 rows of xmin, ymin, xmax, ymax; NaN for features without geometry
+        self.valid = True
+        self._signals = (layer.geometryChanged, layer.featureAdded, layer.featuresDeleted,
+                         layer.subsetStringChanged, layer.dataChanged)
+        for signal in self._signals:
+            signal.connect(self.invalidate)
+
+    def __len__(self):
+        return len(self.feature_ids)
+
+    def memory_bytes(self):
+        return self.feature_ids.nbytes + self.boxes.nbytes
+
+    def invalidate(self, *_args):
+        self.valid = False
+
+    def release(self):
+        """Disconnect from the layer once the cache is dropped."""
+        self.valid = False
+        for signal in self._signals:
+            try:
+                signal.disconnect(self.invalidate)
+            except (TypeError, RuntimeError):
+                pass
+
+    def extent(self, feature_ids):
+        """Union of the boxes of feature_ids, a null rectangle when none has a geometry, None when a feature is unknown."""
+        if not self.valid or not feature_ids:
+            return None
+        query = numpy.fromiter(feature_ids, dtype=numpy.int64, count=len(feature_ids))
+        rows = numpy.searchsorted(self.feature_ids, query)
+        if (rows >= len(self.feature_ids)).any():
+            return None
+        if (self.feature_ids[rows] != query).any():
+            return None
+        boxes = self.boxes[rows]
+        present = ~numpy.isnan(boxes[:, 0])
+        if not present.any():
+            rectangle = QgsRectangle()
+            rectangle.setNull()
+            return rectangle
+        boxes = boxes[present]
+        return QgsRectangle(float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                            float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+
+
+class BBoxTask(QgsTask):
+    """Read the bounding box of every feature in the background, without attributes."""
+
+    def __init__(self, layer):
+        super().__init__(f"Caching feature extents of {layer.name()}", QgsTask.Flag.CanCancel)
+        self.layer = layer
+        self.feature_ids = None
+        self.boxes = None
+        self.exception = None
+        self.total = max(layer.featureCount(), 0)
+        self.request = QgsFeatureRequest().setNoAttributes()
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.setDependentLayers([layer])
+        # Edits made while reading make the boxes stale
+        self.stale = False
+        self._signals = (layer.geometryChanged, layer.featureAdded, layer.featuresDeleted,
+                         layer.subsetStringChanged, layer.dataChanged)
+        for signal in self._signals:
+            signal.connect(self._mark_stale)
+
+    def _mark_stale(self, *_args):
+        self.stale = True
+
+    def run(self):
+        try:
+            feature_ids = array('q')
+            coordinates = array('d')
+            nan = float("nan")
+            for read, feature in enumerate(self.source.getFeatures(self.request), start=1):
+                feature_ids.append(feature.id())
+                geometry = feature.geometry()
+                if geometry.isEmpty():
+                    coordinates.extend((nan, nan, nan, nan))
+                else:
+                    box = geometry.boundingBox()
+                    coordinates.extend((box.xMinimum(), box.yMinimum(), box.xMaximum(), box.yMaximum()))
+                if read % 10000 == 0:
+                    if self.isCanceled():
+                        return False
+                    if self.total:
+                        self.setProgress(min(100.0, 100.0 * read / self.total))
+            ids = numpy.frombuffer(feature_ids, dtype=numpy.int64)
+            boxes = numpy.frombuffer(coordinates, dtype=numpy.float64).reshape(-1, 4)
+            order = numpy.argsort(ids, kind="stable")
+            self.feature_ids = ids[order]
+            self.boxes = boxes[order]
+        except Exception as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def finished(self, result):
+        for signal in self._signals:
+            try:
+                signal.disconnect(self._mark_stale)
+            except (TypeError, RuntimeError):
+                pass
+        if self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Caching feature extents of {self.layer.name()} failed: {self.exception}",
+                "Easy Feature Selector", Qgis.MessageLevel.Warning)
@@ -0,0 +1,108 @@
+from qgis.core import QgsCoordinateTransform
+
+
+class TransformCache:
+    """QgsCoordinateTransform objects shared by every CRS conversion of the dialog.
+
+    Transforms are keyed by source and destination CRS and built with the
+    project transform context, so datum shift grids are only resolved once
+    per CRS pair. The cache is emptied whenever the canvas CRS or the
+    project transform context changes.
+    """
+
+    def __init__(self, canvas, project):
+        self.project = project
+        self.hits = 0
+        self.misses = 0
+        self._transforms = {}  # (source CRS key, destination CRS key) -> QgsCoordinateTransform
+        canvas.destinationCrsChanged.connect(self.clear)
+        project.transformContextChanged.connect(self.clear)
+
+    @staticmethod
+    def crs_key(crs):
+        return crs.authid() or crs.toWkt()
+
+    def transform(self, source_crs, destination_crs):
+        key = (self.crs_key(source_crs), self.crs_key(destination_crs))
+        transform = self._transforms.get(key)
+        if transform is None:
+            self.misses += 1
+            transform = QgsCoordinateTransform(source_crs, destination_crs, self.project.transformContext())
+            self._transforms[key] = transform
+        else:
+            self.hits += 1
+        return transform
+
+    def stats_text(self):
+        return f"Transforms: {self.hits} hits, {self.misses} misses, {len(self._transforms)} cached"
+
+    def clear(self):
+        self._transforms.clear()
+
+
+class ZoomPipeline:
+    """Move the canvas to target extents with as few renders as possible.
+
+    A target already centred at about the right scale is left alone, any
+    other target at the current scale is centred by panning, and only a
+    scale change sets the extent. Renders are counted per user action for stats_text().
+    """
+
+    SCALE_TOLERANCE = 0.1  # Relative map units per pixel difference still taken as the same scale
+    CENTER_TOLERANCE = 2  # Pixels between the target and the canvas centre still taken as centred
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._stats = {}  # Action -> [actions, renders, skipped, panned]
+        self._action = None  # Action whose render is pending
+        canvas.renderStarting.connect(self._on_render_starting)
+        canvas.mapCanvasRefreshed.connect(self._on_render_finished)
+
+    def zoom_to(self, extent, action):
+        """Show extent for a user action; returns False when the canvas did not need to move."""
+        stats = self._stats.setdefault(action, [0, 0, 0, 0])
+        stats[0] += 1
+        canvas = self.canvas
+        if extent.isEmpty():
+            # A point sets no scale: keep the current one
+            if self._centred(extent.center()):
+                stats[2] += 1
+                return False
+            self._action = action
+            stats[3] += 1
+            canvas.setCenter(extent.center())
+            canvas.refresh()
+            return True
+        target_mupp = max(extent.width() / max(canvas.width(), 1), extent.height() / max(canvas.height(), 1))
+        same_scale = abs(canvas.mapUnitsPerPixel() - target_mupp) <= self.SCALE_TOLERANCE * target_mupp
+        if same_scale and self._centred(extent.center()):
+            stats[2] += 1
+            return False
+        self._action = action
+        if same_scale:
+            stats[3] += 1
+            canvas.setCenter(extent.center())
+        else:
+            canvas.setExtent(extent)
+        canvas.refresh()
+        return True
+
+    def _centred(self, point):
+        center = self.canvas.center()
+        tolerance = self.CENTER_TOLERANCE * self.canvas.mapUnitsPerPixel()
+        return abs(center.x() - point.x()) <= tolerance and abs(center.y() - point.y()) <= tolerance
+
+    def stats_text(self):
+        if not self._stats:
+            return "Zoom: no zoom actions"
+        return "Zoom: " + "; ".join(
+            f"{action} {actions} actions, {renders} renders ({renders / actions:.2f} per action), "
+            f"{skipped} skipped, {panned} panned"
+            for action, (actions, renders, skipped, panned) in self._stats.items())
+
+    def _on_render_starting(self):
+        if self._action is not None:
+            self._stats[self._action][1] += 1
+
+    def _on_render_finished(self):
+        self._action = None
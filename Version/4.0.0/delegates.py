@@ -0,0 +1,47 @@
+from qgis.PyQt.QtCore import Qt, QEvent, QSize
+from qgis.PyQt.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+
+class RadioButtonDelegate(QStyledItemDelegate):
+    """Paint the check state of a column as centered radio buttons.
+
+    No widget is created per row: the indicator is drawn by the style and
+    clicks are written back to the model with the CheckStateRole, which
+    keeps the checked row.
+    """
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        if not index.flags() & Qt.ItemFlag.ItemIsUserCheckable:
+            return
+        style = option.widget.style() if option.widget else QApplication.style()
+        button = QStyleOptionButton()
+        button.rect = self._indicator_rect(option, style)
+        button.state = QStyle.StateFlag.State_Enabled
+        if index.model().selection_row() == index.row():
+            button.state |= QStyle.StateFlag.State_On
+        else:
+            button.state |= QStyle.StateFlag.State_Off
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorRadioButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not index.flags() & Qt.ItemFlag.ItemIsUserCheckable:
+            return False
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+            return event.button() == Qt.MouseButton.LeftButton
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            if event.button() != Qt.MouseButton.LeftButton or not option.rect.contains(event.position().toPoint()):
+                return False
+        elif event.type() == QEvent.Type.KeyPress:
+            if event.key() not in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+                return False
+        else:
+            return False
+        # Like an exclusive button group, clicking the checked radio button keeps it checked
+        return model.setData(index, Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+
+    @staticmethod
+    def _indicator_rect(option, style):
+        size = QSize(style.pixelMetric(QStyle.PixelMetric.PM_ExclusiveIndicatorWidth, option, option.widget),
+                     style.pixelMetric(QStyle.PixelMetric.PM_ExclusiveIndicatorHeight, option, option.widget))
+        return QStyle.alignedRect(option.direction, Qt.AlignmentFlag.AlignCenter, size, option.rect)
@@ -0,0 +1,258 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from array import array
+
+from qgis.core import QgsMessageLog, QgsProviderRegistry, QgsTask, Qgis
+
+from .unique_values import ValueIndex
+
+
+class DiskValueCache:
+    """Unique values and value indexes of file-based layers, kept in SQLite across QGIS sessions.
+
+    Entries are keyed by (provider, source URI, field name, subset string)
+    and carry a fingerprint of the data files: their sizes and modification
+    times plus the feature count. An entry whose fingerprint no longer
+    matches is dropped on lookup. Layers without a file fingerprint, with
+    uncommitted edits or on a field the provider does not own are never
+    cached. The least recently used entries are evicted over max_bytes.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._failed = False  # Set once the database cannot be used, the cache then stays off
+
+    def enabled(self):
+        return self.max_bytes > 0 and not self._failed
+
+    def fingerprint(self, layer, field_name):
+        """Return the fingerprint of the data behind layer, or None when it cannot be cached."""
+        provider = layer.dataProvider()
+        if provider is None or layer.isModified():
+            return None
+        fields = layer.fields()
+        field_index = fields.indexOf(field_name)
+        if field_index < 0 or fields.fieldOrigin(field_index) != Qgis.FieldOrigin.Provider:
+            return None
+        path = QgsProviderRegistry.instance().decodeUri(provider.name(), layer.source()).get("path")
+        if not path or not os.path.isfile(path):
+            return None  # Databases and services report no change token
+        stem, extension = os.path.splitext(path)
+        files = [path, path + "-wal"]  # GeoPackage and SpatiaLite commits may still sit in the WAL
+        if extension.lower() == ".shp":
+            files.append(stem + ".dbf")
+        parts = []
+        for file_path in files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            parts.append(f"{os.path.basename(file_path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        parts.append(f"features:{layer.featureCount()}")
+        return "|".join(parts)
+
+    @staticmethod
+    def key(layer, field_name):
+        return (layer.dataProvider().name(), layer.source(), field_name, layer.subsetString())
+
+    def get_task(self, layer, field_name):
+        """Return a task reading the stored values and index of field_name, or None when the layer cannot be cached."""
+        fingerprint = self.fingerprint(layer, field_name) if self.enabled() else None
+        if fingerprint is None:
+            return None
+        return DiskCacheReadTask(self, self.key(layer, field_name), fingerprint)
+
+    def read(self, key, fingerprint):
+        """Return the stored (sorted values tuple, ValueIndex) through a connection of the calling thread, or None.
+
+        An entry stored for another fingerprint is dropped.
+        """
+        connection = self._connect(self.path)
+        try:
+            row = connection.execute(
+                "SELECT fingerprint, value_data, counts, ids FROM entries "
+                "WHERE provider = ? AND source = ? AND field = ? AND subset = ?", key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[0] != fingerprint:
+                self.misses += 1
+                connection.execute(
+                    "DELETE FROM entries WHERE provider = ? AND source = ? AND field = ? AND subset = ?", key)
+                connection.commit()
+                return None
+            connection.execute(
+                "UPDATE entries SET last_used = ? WHERE provider = ? AND source = ? AND field = ? AND subset = ?",
+                (time.time(),) + key)
+            connection.commit()
+        finally:
+            connection.close()
+        values = tuple(json.loads(zlib.decompress(row[1])))
+        counts = array('q')
+        counts.frombytes(row[2])
+        ids = array('q')
+        ids.frombytes(row[3])
+        self.hits += 1
+        return values, ValueIndex.from_arrays(values, counts, ids)
+
+    def put_task(self, layer, field_name, values, index, fingerprint):
+        """Return a task storing sorted values and their index, read from the data at fingerprint, or None."""
+        if fingerprint is None or not self.enabled() or index is None:
+            return None
+        return DiskCacheWriteTask(self, self.key(layer, field_name), fingerprint, values, index)
+
+    def write(self, key, fingerprint, values, index):
+        """Serialize and store an entry through a connection of the calling thread."""
+        counts, ids = index.to_arrays(values)
+        value_data = zlib.compress(json.dumps(list(values), ensure_ascii=False).encode("utf-8"))
+        count_data = counts.tobytes()
+        id_data = ids.tobytes()
+        size = len(value_data) + len(count_data) + len(id_data)
+        if size > self.max_bytes:
+            return
+        connection = self._connect(self.path)
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (provider, source, field, subset, fingerprint, "
+                "value_data, counts, ids, size, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (fingerprint, value_data, count_data, id_data, size, time.time()))
+            self._evict(connection)
+            connection.commit()
+        finally:
+            connection.close()
+
+    def clear(self):
+        """Drop every entry."""
+        connection = self._open()
+        if connection is None:
+            return
+        try:
+            connection.execute("DELETE FROM entries")
+            connection.commit()
+        except sqlite3.Error as e:
+            self.mark_failed(e)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def stats_text(self):
+        return f"Disk cache: {self.hits} hits, {self.misses} misses, {self.path}"
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = connection.execute("SELECT rowid, size FROM entries ORDER BY last_used").fetchall()
+        evicted = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((rowid,))
+            total -= size
+        connection.executemany("DELETE FROM entries WHERE rowid = ?", evicted)
+
+    def _open(self):
+        if self._connection is not None or self._failed:
+            return self._connection
+        try:
+            self._connection = self._connect(self.path)
+        except (sqlite3.Error, OSError) as e:
+            self.mark_failed(e)
+        return self._connection
+
+    @classmethod
+    def _connect(cls, path):
+        """Open the database, creating or replacing its table when the schema differs.
+
+        SQLite connections are bound to the thread that opened them.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=10.0)  # Waits for a write of another thread
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != cls.SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS entries")
+                connection.execute(f"PRAGMA user_version = {cls.SCHEMA_VERSION}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "provider TEXT NOT NULL, source TEXT NOT NULL, field TEXT NOT NULL, subset TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL, value_data BLOB NOT NULL, counts BLOB NOT NULL, ids BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (provider, source, field, subset))")
+            connection.commit()
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def mark_failed(self, error):
+        """Turn the cache off for the session and report why, e.g. after a read or write task failed."""
+        self._failed = True
+        self.close()
+        QgsMessageLog.logMessage(f"Unique value disk cache {self.path} disabled: {error}",
+                                 "Easy Feature Selector", Qgis.MessageLevel.Warning)
+
+
+class DiskCacheReadTask(QgsTask):
+    """Read and decode stored unique values and their index from the DiskValueCache in the background."""
+
+    def __init__(self, cache, key, fingerprint):
+        super().__init__(f"Reading cached unique values of {key[2]}", QgsTask.Flag.CanCancel)
+        self.cache = cache
+        self.key = key
+        self.field_name = key[2]
+        self.fingerprint = fingerprint
+        self.entry = None  # (sorted values tuple, ValueIndex) once read
+        self.exception = None
+
+    def run(self):
+        if self.isCanceled():
+            return False
+        try:
+            self.entry = self.cache.read(self.key, self.fingerprint)
+        except (sqlite3.Error, OSError, ValueError, zlib.error) as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def finished(self, result):
+        if self.exception is not None:
+            self.cache.mark_failed(self.exception)
+
+
+class DiskCacheWriteTask(QgsTask):
+    """Serialize unique values and their index and write them to the DiskValueCache in the background."""
+
+    def __init__(self, cache, key, fingerprint, values, index):
+        super().__init__(f"Caching unique values of {key[2]}", QgsTask.Flag.CanCancel)
+        self.cache = cache
+        self.key = key
+        self.fingerprint = fingerprint
+        self.values = values
+        self.index = index
+        self.exception = None
+
+    def run(self):
+        if self.isCanceled():
+            return False
+        try:
+            self.cache.write(self.key, self.fingerprint, self.values, self.index)
+        except (sqlite3.Error, OSError) as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return True
+
+    def finished(self, result):
+        if self.exception is not None:
+            self.cache.mark_failed(self.exception)
@@ -1,24 +1,61 @@
-from qgis.PyQt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QListWidget, QLineEdit, QCheckBox, QPushButton, QSlider, QSpinBox, QWidget, QTableWidget, QTableWidgetItem, QRadioButton, QButtonGroup, QSizePolicy, QSplitter
+from qgis.PyQt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QListView, QLineEdit, QCheckBox, QPushButton, QSlider, QSpinBox, QWidget, QTableView, QSizePolicy, QSplitter
 from qgis.PyQt.QtCore import Qt, QSettings
-from qgis.PyQt.QtGui import QFont, QColor
+from qgis.PyQt.QtGui import QColor
 from qgis.core import (
-    QgsProject, QgsMapLayer, QgsRasterLayer, QgsCoordinateTransform, QgsFeatureRequest,
-    QgsMapLayerProxyModel, QgsRectangle, QgsGeometry, Qgis,
+    QgsApplication, QgsProject, QgsMapLayer, QgsRasterLayer,
+    QgsMapLayerProxyModel, QgsMessageLog, QgsRectangle, QgsGeometry, Qgis,
 )
 from qgis.gui import QgsCollapsibleGroupBox, QgsMessageBar, QgsMapLayerComboBox, QgsRubberBand
 from qgis.utils import iface
 from qgis.PyQt.QtWidgets import QApplication, QHeaderView, QAbstractItemView
 from qgis.PyQt.QtCore import QTimer, QPoint, pyqtSignal  
 
+import os
+from functools import partial
+
+from .bboxes import BBoxCache, BBoxTask, bbox_cache_available
+from .canvas import TransformCache, ZoomPipeline
+from .delegates import RadioButtonDelegate
+from .disk_cache import DiskValueCache
+from .facets import ColumnarCache, ColumnTask, FacetCache, FacetNavigator, Facets, FacetTask
+from .filters import ValueLookup
+from .models import FeatureAttributesModel, UniqueValuesModel
+from .search import TrigramIndexTask, ValueSearchEngine
+from .selection import SelectionSnapshot
+from .tracing import traced, tracer
+from .unique_values import CardinalityTask, UniqueValueCache, UniqueValueEngine, UniqueValueTask, ValueMultiset, ValueSearchTask
+
 class EasyFeatureSelectionDialog(QDialog):
     _instance = None  # Singleton instance for dialog
     closingPlugin = pyqtSignal()  # Define the closingPlugin signal
     _SETTINGS_GROUP = "easyfeatureselection"
     _SQUARE_SIZE_KEY = "synthetic_square_size"
+    _CACHE_BUDGET_KEY = "unique_values_cache_mb"
+    _DEFAULT_CACHE_BUDGET_MB = 256
+    _DISK_CACHE_KEY = "unique_values_disk_cache_mb"
+    _DEFAULT_DISK_CACHE_MB = 512  # 0 keeps unique values in memory only
+    _TRIGRAM_THRESHOLD_KEY = "trigram_index_threshold"
+    _DEFAULT_TRIGRAM_THRESHOLD = 100000  # Fewer values are searched linearly
+    _BBOX_CACHE_KEY = "bbox_cache_max_features"
+    _DEFAULT_BBOX_CACHE_MAX_FEATURES = 5000000  # Larger layers, or 0, get no per-feature extent cache
+    _TRACING_KEY = "trace_spans"  # 1 times the dialog slots and dumps them when the dialog closes
+    _TRACE_FILE_KEY = "trace_file"
     _DEFAULT_SQUARE_SIZE = 50
     _MAX_SQUARE_SIZE = 3000
     _SQUARE_BORDER_COLOR = QColor(0, 120, 215, 220)
     _SQUARE_BORDER_WIDTH = 2
+    _SYNC_UNIQUE_VALUES_LIMIT = 20000  # Smaller layers are listed without a background task
+    _PAGED_LIST_KEY = "paged_list_threshold"
+    _DEFAULT_PAGED_LIST_THRESHOLD = 200000  # More estimated values are listed page by page, without value index
+    _SEARCH_ONLY_KEY = "search_only_threshold"
+    _DEFAULT_SEARCH_ONLY_THRESHOLD = 2000000  # More estimated values are only listed as search results
+    _CARDINALITY_SAMPLE_SIZE = 20000  # Features read to estimate the number of unique values
+    _LIST_PAGE_SIZE = 10000
+    _SEARCH_ONLY_LIMIT = 1000  # Values listed per search in search-only mode
+    _SEARCH_DEBOUNCE_MS = 200
+    _BROWSE_SETTLE_MS = 150  # Quiet time after the last list move before the canvas follows
+    _SLIDER_DEBOUNCE_MS = 250  # Zoom slider changes made without dragging are applied after this
+    _FACET_VALUE_LIMIT = 500  # Most frequent values listed per facet
 
     @classmethod
     def show_dialog(cls):
@@ -171,7 +208,11 @@ class EasyFeatureSelectionDialog(QDialog):
         self.unique_values_label = QLabel("Select From the Unique Values")
         self.values_group_layout.addWidget(self.unique_values_label)
         
-        self.unique_values_list = QListWidget()
+        self.unique_values_model = UniqueValuesModel(self)
+        self.unique_values_list = QListView()
+        self.unique_values_list.setModel(self.unique_values_model)
+        self.unique_values_list.setUniformItemSizes(True)  # Layout cost independent of the number of values
+        self.unique_values_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.values_group_layout.addWidget(self.unique_values_list)
         
         self.values_group_box.setLayout(self.values_group_layout)
@@ -203,13 +244,36 @@ class EasyFeatureSelectionDialog(QDialog):
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText('Search...')
         self.search_box.setClearButtonEnabled(True)
-        self.search_box.textChanged.connect(self.filter_values)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
         self.search_group_layout.addWidget(self.search_box)
+        self.search_engine = ValueSearchEngine()
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self._SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.filter_values)
+        self._trigram_task = None
+        # Coalesces rapid list moves: the canvas only follows the last value browsed to
+        self._browse_timer = QTimer(self)
+        self._browse_timer.setSingleShot(True)
+        self._browse_timer.setInterval(self._BROWSE_SETTLE_MS)
+        self._browse_timer.timeout.connect(self._on_browsing_settled)
+        self._pending_highlight = None  # (field name, value, already selected) applied once browsing settles
+
+        self.fuzzy_search_checkbox = QCheckBox("Fuzzy search (rank values by similarity)")
+        self.fuzzy_search_checkbox.setChecked(False)
+        self.fuzzy_search_checkbox.stateChanged.connect(self.toggle_fuzzy_search)
+        self.search_group_layout.addWidget(self.fuzzy_search_checkbox)
         
         # Interactive zoom checkbox
         self.interact_checkbox = QCheckBox("Interactive Zooming and Panning to Selected Features")
         self.interact_checkbox.setChecked(False)  # Set to unchecked by default
         self.search_group_layout.addWidget(self.interact_checkbox)
+
+        # Select every feature holding the list value instead of the first one
+        self.select_all_checkbox = QCheckBox("Select all matching features")
+        self.select_all_checkbox.setChecked(False)
+        self.select_all_checkbox.stateChanged.connect(self.toggle_select_all_matches)
+        self.search_group_layout.addWidget(self.select_all_checkbox)
         
         self.zoom_label = QLabel("Select zoom level:")
         self.search_group_layout.addWidget(self.zoom_label)
@@ -221,6 +285,11 @@ class EasyFeatureSelectionDialog(QDialog):
         self.zoom_slider.setTickInterval(5)
         self.zoom_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
         self.search_group_layout.addWidget(self.zoom_slider)
+        # Dragging the slider zooms once on release, other changes once they stop
+        self._slider_zoom_timer = QTimer(self)
+        self._slider_zoom_timer.setSingleShot(True)
+        self._slider_zoom_timer.setInterval(self._SLIDER_DEBOUNCE_MS)
+        self._slider_zoom_timer.timeout.connect(self.apply_slider_zoom)
 
         self.synthetic_square_checkbox = QCheckBox("Add Synthetic Square (for points)")
         self.synthetic_square_checkbox.setChecked(True)
@@ -253,6 +322,49 @@ class EasyFeatureSelectionDialog(QDialog):
         self.search_group_box.setLayout(self.search_group_layout)
         self.left_layout.addWidget(self.search_group_box)
 
+        # Facet Navigator GroupBox: drill down through any number of pinned fields
+        self.facet_group_box = QgsCollapsibleGroupBox("Facet Navigator")
+        self.facet_group_box.setStyleSheet("""
+            QgsCollapsibleGroupBox {
+                border: 1px solid #b9b9b9;
+                margin-top: 15px;  /* Add space for title */
+                padding-top: 8px;  /* Space between title and content */
+            }
+            QgsCollapsibleGroupBox::title {
+                subcontrol-origin: margin;
+                subcontrol-position: top left;
+                padding: 3px;
+                left: 5px;
+                top: -10px;  /* Pull the title up */
+            }
+        """)
+        self.facet_group_box.setChecked(True)
+        self.facet_group_layout = QVBoxLayout()
+        self.facet_group_layout.setSpacing(3)  # Reduce spacing between widgets
+
+        self.facet_label = QLabel("Pin fields to narrow down the features:")
+        self.facet_group_layout.addWidget(self.facet_label)
+
+        facet_pin_row = QHBoxLayout()
+        self.facet_field_combo_box = QComboBox()
+        facet_pin_row.addWidget(self.facet_field_combo_box, 1)
+        self.facet_pin_button = QPushButton("Pin Field")
+        self.facet_pin_button.clicked.connect(self.pin_facet_field)
+        facet_pin_row.addWidget(self.facet_pin_button)
+        self.facet_group_layout.addLayout(facet_pin_row)
+
+        # One row per pinned field: name, values with counts and an unpin button
+        self.facet_rows_layout = QVBoxLayout()
+        self.facet_rows_layout.setSpacing(3)
+        self.facet_group_layout.addLayout(self.facet_rows_layout)
+
+        self.facet_result_label = QLabel("")
+        self.facet_group_layout.addWidget(self.facet_result_label)
+
+        self.facet_group_box.setLayout(self.facet_group_layout)
+        self.facet_group_box.setCollapsed(True)
+        self.left_layout.addWidget(self.facet_group_box)
+
         # Close Button
         self.close_button = QPushButton('Close')
         self.close_button.setFixedSize(100, 30)
@@ -299,15 +411,25 @@ class EasyFeatureSelectionDialog(QDialog):
         self.second_level_checkbox.stateChanged.connect(self.toggle_additional_selection)
         self.table_layout.insertWidget(0, self.second_level_checkbox)
 
-        # Table widget with increased height
-        self.table_widget = QTableWidget()
+        # Attribute table with increased height, served by a model so wide layers cost no items
+        self.table_model = FeatureAttributesModel(self)
+        self.table_widget = QTableView()
+        self.table_widget.setModel(self.table_model)
+        self.selection_column_delegate = RadioButtonDelegate(self.table_widget)
+        self.table_widget.setItemDelegateForColumn(FeatureAttributesModel.SELECTION_COLUMN,
+                                                   self.selection_column_delegate)
+        self.table_model.selectionRowChanged.connect(self.on_selection_row_changed)
         self.table_widget.setMinimumHeight(570)  # Reduced to 95% of original height
         self.table_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.table_widget.setColumnCount(2)  # Start with 2 columns by default
-        self.table_widget.setHorizontalHeaderLabels(["Field Name", "Value"])  # Initial headers without Additional Selection
         self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # Only the visible rows are measured when a column is resized to its contents
+        self.table_widget.horizontalHeader().setResizeContentsPrecision(0)
         self.table_widget.verticalHeader().setVisible(False)
+        # Uniform row heights: rows are never measured one by one
+        self.table_widget.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table_widget.verticalHeader().setDefaultSectionSize(self.table_widget.fontMetrics().height() + 8)
         self.table_widget.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table_widget.setWordWrap(False)
         
         # Style the header with right borders
         header_style = """
@@ -373,16 +495,48 @@ class EasyFeatureSelectionDialog(QDialog):
         self.values_group_box.collapsedStateChanged.connect(self.handle_group_collapse)
         self.search_group_box.collapsedStateChanged.connect(self.handle_group_collapse)
         self.table_group_box.collapsedStateChanged.connect(self.handle_group_collapse)
+        self.facet_group_box.collapsedStateChanged.connect(self.handle_group_collapse)
 
         # Initialize layer and connections
         self.layer = None
-        self.radio_button_group = QButtonGroup(self)  # Group for radio buttons
+        self.value_lookup = None
         self.previous_combo_row = None  # Track the row of the previous combo box
+        self._keep_table_rows = False  # Set while a 2nd level selection replaces the selection
         self.current_list_value = None
         self.current_list_field = None
         self.synthetic_square_band = None
+        self._disk_read_task = None  # Reads the values of a large layer stored by an earlier session
+        self._cardinality_task = None  # Estimates the unique values before a large layer is listed
+        self._unique_value_task = None
+        self._relist_on_show = False  # Set when closing interrupted the listing of the values
+        self._value_index = None
+        self._value_index_generation = None
+        self.value_multiset = None  # Follows the listed field while the layer is edited
+        self._listing = UniqueValueEngine.FULL_LIST
+        self._cardinality_estimate = None  # (estimated unique values, exact) of the listed field
+        self._value_search_task = None
+        self._search_complete = True  # False when the last search-only result hit _SEARCH_ONLY_LIMIT
+        self._last_lookup_path = None
+        self._selection_snapshot = None
+        self.unique_value_cache = UniqueValueCache(self._load_cache_budget_mb() * 1048576)
+        self.disk_cache = DiskValueCache(
+            os.path.join(QgsApplication.qgisSettingsDirPath(), "easyfeatureselection_cache.sqlite"),
+            self._load_int_setting(self._DISK_CACHE_KEY, self._DEFAULT_DISK_CACHE_MB) * 1048576)
+        self._disk_cache_tasks = set()  # Writes still running, each holds the values it stores
+        self.facet_cache = FacetCache()
+        self._facet_task = None
+        self._facets = None  # Facets of the current list value, None while they are counted
+        self.facet_navigator = None
+        self._facet_rows = {}  # Pinned field name -> (row widget, values combo box)
+        self._column_task = None
         self._synthetic_base_extent = None
         self._reference_mupp = None
+        self.transform_cache = TransformCache(iface.mapCanvas(), QgsProject.instance())
+        self.zoom_pipeline = ZoomPipeline(iface.mapCanvas())
+        self.bbox_cache = None
+        self._bbox_task = None
+        self._bbox_requested = False  # Set once a selection of the layer needed the cache
+        tracer.enabled = bool(self._load_int_setting(self._TRACING_KEY, 0))
         self.connect_signals()
         self._remove_leftover_square_layer()
 
@@ -435,18 +589,26 @@ class EasyFeatureSelectionDialog(QDialog):
     def disconnect_signals(self):
         """Disconnect signals from the previous layer and dialog widgets."""
         if self.layer and not isinstance(self.layer, QgsRasterLayer):
-            for slot in (self.populate_table_with_selected_feature, self.update_listbox_with_selection):
+            for slot in (self._invalidate_selection_snapshot, self.populate_table_with_selected_feature,
+                         self.update_listbox_with_selection):
                 try:
                     self.layer.selectionChanged.disconnect(slot)
                 except (TypeError, RuntimeError):
                     pass
+            for signal, slot in ((self.layer.editingStarted, self._start_value_multiset),
+                                 (self.layer.editingStopped, self._on_editing_stopped)):
+                try:
+                    signal.disconnect(slot)
+                except (TypeError, RuntimeError):
+                    pass
 
         widget_slots = (
             (self.field_combo_box, self.field_combo_box.currentIndexChanged, self.on_field_changed),
-            (self.unique_values_list, self.unique_values_list.currentRowChanged, self.highlight_features),
-            (self.search_box, self.search_box.textChanged, self.filter_values),
+            (self.unique_values_list, self.unique_values_list.selectionModel().currentRowChanged, self.on_current_value_changed),
+            (self.search_box, self.search_box.textChanged, self.on_search_text_changed),
             (self.interact_checkbox, self.interact_checkbox.stateChanged, self.check_interactive_selection),
             (self.zoom_slider, self.zoom_slider.valueChanged, self.update_zoom_label),
+            (self.zoom_slider, self.zoom_slider.sliderReleased, self.apply_slider_zoom),
             (self.two_way_selection_checkbox, self.two_way_selection_checkbox.stateChanged, self.toggle_two_way_selection),
         )
         for _widget, signal, slot in widget_slots:
@@ -459,26 +621,35 @@ class EasyFeatureSelectionDialog(QDialog):
         """Connects signals to methods after all methods are defined."""
         self.disconnect_signals()
         if self.layer and not isinstance(self.layer, QgsRasterLayer):
+            # Connected first so every other selectionChanged slot sees a fresh snapshot
+            self.layer.selectionChanged.connect(self._invalidate_selection_snapshot)
             self.layer.selectionChanged.connect(self.populate_table_with_selected_feature)
+            self.layer.editingStarted.connect(self._start_value_multiset)
+            self.layer.editingStopped.connect(self._on_editing_stopped)
             self.field_combo_box.currentIndexChanged.connect(self.on_field_changed)
-            self.unique_values_list.currentRowChanged.connect(self.highlight_features)
+            self.unique_values_list.selectionModel().currentRowChanged.connect(self.on_current_value_changed)
             if self.two_way_selection_checkbox.isChecked():
                 self.layer.selectionChanged.connect(self.update_listbox_with_selection)
-        self.search_box.textChanged.connect(self.filter_values)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
         self.interact_checkbox.stateChanged.connect(self.check_interactive_selection)
         self.zoom_slider.valueChanged.connect(self.update_zoom_label)
+        self.zoom_slider.sliderReleased.connect(self.apply_slider_zoom)
         self.two_way_selection_checkbox.stateChanged.connect(self.toggle_two_way_selection)
 
     def on_layer_changed(self, layer):
         """Handle the event when the active layer changes."""
         self.disconnect_signals()
+        self._cancel_unique_value_task()
+        self._invalidate_selection_snapshot()
         self._clear_synthetic_square_band()
         self._reference_mupp = None
         
         # Clear all widgets first
         self.field_combo_box.clear()
-        self.unique_values_list.clear()
+        self.unique_values_model.clear()
+        self._on_unique_values_replaced()
         self.clear_table()
+        self._update_unique_values_title()
         
         if layer and isinstance(layer, QgsRasterLayer):
             self.raster_warning.show()
@@ -508,13 +679,30 @@ class EasyFeatureSelectionDialog(QDialog):
     def update_layer(self, layer):
         """Update the active layer and UI components."""
         self.layer = layer
-        
+        if self.value_lookup is not None:
+            try:
+                self.value_lookup.layer.updatedFields.disconnect(self.value_lookup.builder.clear)
+            except (TypeError, RuntimeError):
+                pass  # Layer already deleted
+        self.value_lookup = None
+        self._stop_value_multiset()
+        self._cancel_value_search_task()
+        self._cancel_pending_highlight()
+        self._cancel_facet_task()
+        self._facets = None
+        self._reset_facet_navigator()
+        self._reset_bbox_cache()
+
         # Clear all widgets first
         self.field_combo_box.clear()
-        self.unique_values_list.clear()
+        self.unique_values_model.clear()
+        self._on_unique_values_replaced()
         self.clear_table()
         
         if layer and layer.type() == QgsMapLayer.LayerType.VectorLayer:
+            # Prepared filter expressions are kept until the fields change
+            self.value_lookup = ValueLookup(layer)
+            layer.updatedFields.connect(self.value_lookup.builder.clear)
             self.update_field_names()
             self.update_unique_values()
         else:
@@ -523,221 +711,817 @@ class EasyFeatureSelectionDialog(QDialog):
     def update_field_names(self):
         """Update the field names in the combo box."""
         if self.layer:
+            field_names = [field.name() for field in self.layer.fields()]
             self.field_combo_box.clear()
-            self.field_combo_box.addItems([field.name() for field in self.layer.fields()])
+            self.field_combo_box.addItems(field_names)
+            self.facet_field_combo_box.clear()
+            self.facet_field_combo_box.addItems(field_names)
             if self.field_combo_box.count() == 0:
                 self.clear_table()
 
+    @traced
     def on_field_changed(self):
         """Handle field selection change event."""
         if not hasattr(self.layer, 'selectedFeatures'):
             return
         self.update_unique_values()
         # Update the table when field changes
-        if self.layer and len(self.layer.selectedFeatures()) > 0:
+        if self.layer and self._selection().count() > 0:
             self.populate_table_with_selected_feature()
 
+    def _selection(self):
+        """Return the snapshot of the current selection, shared until the selection changes."""
+        snapshot = self._selection_snapshot
+        if snapshot is None or snapshot.layer is not self.layer:
+            snapshot = self._selection_snapshot = SelectionSnapshot(self.layer, self._current_bbox_cache())
+        return snapshot
+
+    def _invalidate_selection_snapshot(self, *_args):
+        self._selection_snapshot = None
+
+    def _current_bbox_cache(self):
+        """The per-feature extent cache of the layer, None while it is built or stale.
+
+        The cache is built the first time a selection of the layer needs
+        it, not on every layer switch, so its full read of the geometries
+        does not compete with listing the values.
+        """
+        cache = self.bbox_cache
+        if cache is None or cache.layer is not self.layer:
+            if not self._bbox_requested and self.layer is not None:
+                self._start_bbox_task()
+            return None
+        if not cache.valid:
+            # Rebuilt once editing is over, not after every edit
+            if not self.layer.isEditable():
+                self._start_bbox_task()
+            return None
+        return cache
+
+    def _start_bbox_task(self):
+        """Read the extent of every feature in the background when NumPy is available."""
+        self._reset_bbox_cache()
+        self._bbox_requested = True
+        layer = self.layer
+        max_features = self._load_int_setting(self._BBOX_CACHE_KEY, self._DEFAULT_BBOX_CACHE_MAX_FEATURES)
+        if (not bbox_cache_available() or layer is None or not layer.isSpatial()
+                or not 0 < layer.featureCount() <= max_features):
+            return
+        task = BBoxTask(layer)
+        task.taskCompleted.connect(partial(self._on_bbox_task_finished, task))
+        task.taskTerminated.connect(partial(self._on_bbox_task_finished, task))
+        self._bbox_task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_bbox_task_finished(self, task):
+        if task is not self._bbox_task:
+            return
+        self._bbox_task = None
+        if task.stale:
+            self._bbox_requested = False  # Read again when the next selection needs it
+        if task.boxes is None or task.stale or task.layer is not self.layer:
+            return
+        self.bbox_cache = BBoxCache(task.layer, task.feature_ids, task.boxes)
+        self._invalidate_selection_snapshot()
+
+    def _cancel_bbox_task(self):
+        task = self._bbox_task
+        self._bbox_task = None
+        if task is not None:
+            self._bbox_requested = False  # Not built: started again when a selection needs it, e.g. after reopening
+            try:
+                task.cancel()
+            except RuntimeError:
+                pass  # Task already finished and deleted by the task manager
+
+    def _reset_bbox_cache(self):
+        self._cancel_bbox_task()
+        if self.bbox_cache is not None:
+            self.bbox_cache.release()
+            self.bbox_cache = None
+        self._bbox_requested = False
+
+    @traced
     def update_unique_values(self):
         """Update the list of unique values based on the selected field."""
-        self.unique_values_list.clear()
+        self._cancel_unique_value_task()
+        self._stop_value_multiset()
+        self._cancel_value_search_task()
+        self._set_listing(UniqueValueEngine.FULL_LIST, None)
+        self.unique_values_model.clear()
+        self._on_unique_values_replaced()
+        self._set_value_index(None)
         field_name = self.field_combo_box.currentText()
         if self.layer and field_name:
-            unique_values = set(str(f[field_name]) for f in self.layer.getFeatures() if f[field_name] is not None)
-            self.unique_values_list.addItems(sorted(unique_values))
+            cached = self.unique_value_cache.get(self.layer, field_name)
+            self.values_group_box.setToolTip(self.unique_value_cache.stats_text())
+            generation = self.unique_value_cache.generation(self.layer)
+            feature_count = self.layer.featureCount()
+            disk_task = None
+            if cached is None and feature_count > self._SYNC_UNIQUE_VALUES_LIMIT:
+                disk_task = self.disk_cache.get_task(self.layer, field_name)
+            if cached is not None:
+                self._show_cached_values(cached[0], cached[1], generation)
+            elif disk_task is not None:
+                # Large file layers keep their values from an earlier session
+                self._start_disk_read_task(disk_task, generation)
+            elif 0 <= feature_count <= self._SYNC_UNIQUE_VALUES_LIMIT:
+                # Small layers: one scan gives both the values and the value index
+                index = UniqueValueEngine(self.layer, field_name).build_index()
+                unique_values = tuple(sorted(index.keys()))  # Shared by the cache and the model
+                self.unique_value_cache.put(self.layer, field_name, unique_values, generation, index)
+                self.unique_values_model.set_values(unique_values)
+                self._on_unique_values_replaced()
+                self._set_value_index(index, generation)
+                self._update_unique_values_title()
+                self._start_value_multiset()
+            else:
+                self._start_cardinality_task(field_name)
         else:
             self.clear_table()
+            self._update_unique_values_title()
+
+    def _show_cached_values(self, values, index, generation):
+        """List values kept by the memory or disk cache."""
+        if index is None:
+            # Listed page by page before, when the field was found to have too many values
+            self._set_listing(UniqueValueEngine.listing(len(values), self._load_int_setting(
+                self._PAGED_LIST_KEY, self._DEFAULT_PAGED_LIST_THRESHOLD), 0), None)
+        self.unique_values_model.set_values(values)
+        self._on_unique_values_replaced()
+        self._set_value_index(index, generation)
+        self._update_unique_values_title()
+        self._start_value_multiset()
+
+    def _start_disk_read_task(self, task, generation):
+        """Read and decode the values stored by an earlier session in the background."""
+        task.cache_generation = generation
+        task.taskCompleted.connect(partial(self._on_disk_read_task_finished, task))
+        task.taskTerminated.connect(partial(self._on_disk_read_task_finished, task))
+        self._disk_read_task = task
+        self._update_unique_values_title()
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_disk_read_task_finished(self, task):
+        """List the stored values, or collect them when nothing usable was stored."""
+        if task is not self._disk_read_task:
+            return  # Superseded by another field or layer
+        self._disk_read_task = None
+        if not self.layer or task.field_name != self.field_combo_box.currentText():
+            self._update_unique_values_title()
+            return
+        if task.entry is None or task.cache_generation != self.unique_value_cache.generation(self.layer):
+            self._start_cardinality_task(task.field_name)
+            return
+        values, index = task.entry
+        self.unique_value_cache.put(self.layer, task.field_name, values, task.cache_generation, index)
+        self._show_cached_values(values, index, task.cache_generation)
+
+    def _start_cardinality_task(self, field_name):
+        """Estimate the number of unique values in a background task, which then decides how they are listed."""
+        task = CardinalityTask(self.layer, field_name, self._CARDINALITY_SAMPLE_SIZE)
+        task.taskCompleted.connect(partial(self._on_cardinality_task_finished, task))
+        task.taskTerminated.connect(partial(self._on_cardinality_task_finished, task))
+        self._cardinality_task = task
+        self._update_unique_values_title()
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_cardinality_task_finished(self, task):
+        """List the values the way the estimate calls for: a full list, a paged list or search-only."""
+        if task is not self._cardinality_task:
+            return  # Superseded by another field or layer
+        self._cardinality_task = None
+        if not self.layer or task.field_name != self.field_combo_box.currentText():
+            self._update_unique_values_title()
+            return
+        if task.estimate is None:
+            self._start_unique_value_task(task.field_name)  # Failed, reported by the task: list every value
+            return
+        listing = UniqueValueEngine.listing(
+            task.estimate[0],
+            self._load_int_setting(self._PAGED_LIST_KEY, self._DEFAULT_PAGED_LIST_THRESHOLD),
+            self._load_int_setting(self._SEARCH_ONLY_KEY, self._DEFAULT_SEARCH_ONLY_THRESHOLD))
+        self._set_listing(listing, task.estimate)
+        if listing == UniqueValueEngine.SEARCH_ONLY:
+            self._update_unique_values_title()
+            if self.search_box.text():
+                self.filter_values()
+        else:
+            self._start_unique_value_task(task.field_name)
+
+    def _set_listing(self, listing, estimate):
+        """Switch between the full list, the paged list and search-only mode."""
+        self._listing = listing
+        self._cardinality_estimate = estimate
+        self._search_complete = True
+        self.unique_values_model.set_page_size(
+            self._LIST_PAGE_SIZE if listing == UniqueValueEngine.PAGED_LIST else None)
+
+    def _start_unique_value_task(self, field_name):
+        """Collect unique values in a background task that fills the list as it runs."""
+        # The value index of millions of values would not fit the cache, paged lists look values up instead
+        task = UniqueValueTask(self.layer, field_name, build_index=self._listing == UniqueValueEngine.FULL_LIST)
+        task.cache_generation = self.unique_value_cache.generation(self.layer)
+        task.disk_fingerprint = self.disk_cache.fingerprint(self.layer, field_name)
+        task.valuesFound.connect(partial(self._on_unique_values_found, task))
+        task.progressChanged.connect(partial(self._on_unique_values_progress, task))
+        task.taskCompleted.connect(partial(self._on_unique_value_task_finished, task, True))
+        task.taskTerminated.connect(partial(self._on_unique_value_task_finished, task, False))
+        self._unique_value_task = task
+        self._update_unique_values_title(0)
+        QgsApplication.taskManager().addTask(task)
+
+    def _cancel_unique_value_task(self):
+        """Cancel the running disk cache read, cardinality estimate and unique value scan; their late results are ignored."""
+        for task in (self._disk_read_task, self._cardinality_task, self._unique_value_task):
+            if task is not None:
+                try:
+                    task.cancel()
+                except RuntimeError:
+                    pass  # Task already finished and deleted by the task manager
+        self._disk_read_task = None
+        self._cardinality_task = None
+        self._unique_value_task = None
+
+    def listing_in_progress(self):
+        """Whether a background task is still reading, estimating or collecting the listed values."""
+        return (self._disk_read_task is not None or self._cardinality_task is not None
+                or self._unique_value_task is not None)
+
+    def _on_unique_values_found(self, task, values):
+        if task is not self._unique_value_task:
+            return
+        if task.indexing:
+            self.unique_values_model.set_values(tuple(values))  # The provider listed every value at once
+            self._on_unique_values_replaced()
+        else:
+            self.unique_values_model.append_values(values)
+            self.search_engine.append_values(self.unique_values_model.values(), values)
+            if self.unique_values_model.is_filtered():
+                self.filter_values()
+        self._update_unique_values_title(task.progress())
+
+    def _on_unique_values_progress(self, task, progress):
+        if task is self._unique_value_task:
+            self._update_unique_values_title(progress, task.indexing)
+
+    def _on_unique_value_task_finished(self, task, completed):
+        if task is not self._unique_value_task:
+            return
+        self._unique_value_task = None
+        self._sort_streamed_values()
+        if completed and self.layer:
+            # The sorted tuple of the model is shared with both caches
+            values = self.unique_values_model.values()
+            self.unique_value_cache.put(
+                self.layer, task.field_name, values, task.cache_generation, task.index, task.size)
+            self._set_value_index(task.index, task.cache_generation)
+            if task.cache_generation == self.unique_value_cache.generation(self.layer):
+                self._start_disk_cache_task(task.field_name, values, task.index, task.disk_fingerprint)
+        self._update_unique_values_title()
+        if completed:
+            self._start_value_multiset()
+
+    def _start_disk_cache_task(self, field_name, values, index, fingerprint):
+        """Write the values and their index to the disk cache in the background."""
+        task = self.disk_cache.put_task(self.layer, field_name, values, index, fingerprint)
+        if task is None:
+            return
+        task.taskCompleted.connect(partial(self._on_disk_cache_task_finished, task))
+        task.taskTerminated.connect(partial(self._on_disk_cache_task_finished, task))
+        self._disk_cache_tasks.add(task)
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_disk_cache_task_finished(self, task):
+        self._disk_cache_tasks.discard(task)
+
+    def _start_value_multiset(self):
+        """Follow the edits of the listed field from now on, instead of listing its values again."""
+        self._stop_value_multiset()
+        field_name = self.field_combo_box.currentText()
+        if (not self.layer or not field_name or not self.layer.isEditable()
+                or self.listing_in_progress() or self._listing != UniqueValueEngine.FULL_LIST):
+            return
+        index = self._current_value_index()
+        if index is None:
+            # The layer changed since the list was filled: one scan, then edits are followed
+            index = UniqueValueEngine(self.layer, field_name).build_index()
+        self.value_multiset = ValueMultiset(self.layer, field_name, index, self._on_listed_values_changed)
+        listed = set(self.unique_values_model.values())
+        keys = self.value_multiset.keys()
+        self._on_listed_values_changed(sorted(key for key in keys if key not in listed),
+                                       sorted(value for value in listed if value not in keys))
+
+    def _stop_value_multiset(self):
+        if self.value_multiset is not None:
+            self.value_multiset.release()
+            self.value_multiset = None
+
+    def _on_editing_stopped(self):
+        """Drop the multiset; the edited list is compacted and indexed for search again."""
+        multiset = self.value_multiset
+        if multiset is None:
+            return
+        # Undoes nothing after a commit, the journal is empty by then
+        multiset.rollback()
+        self._stop_value_multiset()
+        if not isinstance(self.unique_values_model.values(), tuple):
+            self._sort_streamed_values()
+
+    def _on_listed_values_changed(self, appeared, disappeared):
+        """Insert and remove single rows of the list for values edits created or removed."""
+        if not appeared and not disappeared:
+            return
+        selection_model = self.unique_values_list.selectionModel()
+        # Removing the current row must not highlight its neighbour
+        selection_model.blockSignals(True)
+        try:
+            for value in disappeared:
+                position = self.unique_values_model.remove_value(value)
+                if position >= 0:
+                    self.search_engine.value_removed(self.unique_values_model.values(), position)
+            for value in appeared:
+                position = self.unique_values_model.insert_value(value)
+                if position >= 0:
+                    self.search_engine.value_inserted(self.unique_values_model.values(), position)
+        finally:
+            selection_model.blockSignals(False)
+        if self.unique_values_model.is_filtered():
+            self.filter_values()
+        self._update_unique_values_title()
+
+    def _sort_streamed_values(self):
+        """Sort the streamed values, keeping the current value without re-highlighting it."""
+        current_value = self._current_list_item_value()
+        if not self.unique_values_model.sort_values():
+            return  # Listed sorted at once, e.g. by the provider: searched and indexed already
+        self._on_unique_values_replaced()
+        self._restore_current_value(current_value)
+
+    def _on_unique_values_replaced(self):
+        """Point the search engine at the new values and re-apply the search text."""
+        values = self.unique_values_model.values()
+        self.search_engine.set_values(values)
+        self._cancel_trigram_task()
+        self._update_search_tooltip()
+        if values and (self.fuzzy_search_checkbox.isChecked() or len(values) >= self._load_int_setting(
+                self._TRIGRAM_THRESHOLD_KEY, self._DEFAULT_TRIGRAM_THRESHOLD)):
+            self._start_trigram_task(values)
+        if self.search_box.text():
+            self.filter_values()
+
+    def _start_trigram_task(self, values):
+        """Build the substring search index of a large value list in the background."""
+        # A snapshot: edits insert into and remove from the listed values while the task reads them
+        task = TrigramIndexTask(tuple(values))
+        task.search_generation = self.search_engine.generation()
+        task.taskCompleted.connect(partial(self._on_trigram_task_finished, task, True))
+        task.taskTerminated.connect(partial(self._on_trigram_task_finished, task, False))
+        self._trigram_task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _cancel_trigram_task(self):
+        task = self._trigram_task
+        self._trigram_task = None
+        if task is not None:
+            try:
+                task.cancel()
+            except RuntimeError:
+                pass  # Task already finished and deleted by the task manager
+
+    def _on_trigram_task_finished(self, task, completed):
+        if task is not self._trigram_task:
+            return
+        self._trigram_task = None
+        # A terminated task leaves a partial index; the next fuzzy toggle or list change builds it again
+        if completed and self.search_engine.set_index(task.search_generation, task.keys, task.index):
+            self._update_search_tooltip()
+            if self.fuzzy_search_checkbox.isChecked() and self.search_box.text():
+                self.filter_values()  # Rank again now that similar values can be found
+
+    def _update_search_tooltip(self):
+        """Expose the memory held by the search index."""
+        if self.search_engine.has_index():
+            megabytes = self.search_engine.index_memory_bytes() / 1048576
+            self.search_box.setToolTip(
+                f"Substring index over {len(self.search_engine.values()):,} values ({megabytes:.1f} MB)")
+        else:
+            self.search_box.setToolTip("")
+
+    def _current_list_item_value(self):
+        return self.unique_values_model.value(self.unique_values_list.currentIndex().row())
+
+    def _restore_current_value(self, value):
+        """Make value current again after a model reset, without highlighting it a second time."""
+        if value is None:
+            return
+        row = self.unique_values_model.find(value)
+        if row < 0:
+            return
+        selection_model = self.unique_values_list.selectionModel()
+        selection_model.blockSignals(True)
+        try:
+            self.unique_values_list.setCurrentIndex(self.unique_values_model.index(row))
+        finally:
+            selection_model.blockSignals(False)
+        self.unique_values_list.viewport().update()
+
+    def _set_value_index(self, index, generation=None):
+        self._value_index = index
+        self._value_index_generation = generation
+
+    def _current_value_index(self):
+        """Return the value index of the listed field while the layer has not changed since it was built."""
+        if self._value_index is None or not self.layer:
+            return None
+        if self._value_index_generation != self.unique_value_cache.generation(self.layer):
+            self._set_value_index(None)
+        return self._value_index
+
+    def _update_unique_values_title(self, progress=None, indexing=False):
+        """Show the number of listed values, the estimate while it is not known, and the scan progress while loading."""
+        count = len(self.unique_values_model.values())
+        estimate = ""
+        if self._cardinality_estimate is not None:
+            value, exact = self._cardinality_estimate
+            estimate = f"{value:,}" if exact else f"~{value:,}"
+        if self._disk_read_task is not None:
+            self.values_group_box.setTitle("Unique Values (reading cache...)")
+        elif self._cardinality_task is not None:
+            self.values_group_box.setTitle("Unique Values (estimating...)")
+        elif self._listing == UniqueValueEngine.SEARCH_ONLY:
+            if self._value_search_task is not None:
+                self.values_group_box.setTitle(f"Unique Values ({estimate}, searching...)")
+            elif self.search_box.text():
+                more = "" if self._search_complete else "+"
+                self.values_group_box.setTitle(f"Unique Values ({count:,}{more} matching of {estimate})")
+            else:
+                self.values_group_box.setTitle(f"Unique Values ({estimate}, type to search)")
+        elif progress is not None:
+            stage = "indexing" if indexing else "loading"
+            of_estimate = f" of {estimate}" if estimate else ""
+            self.values_group_box.setTitle(f"Unique Values ({count:,}{of_estimate}, {stage} {progress:.0f}%)")
+        elif self.layer and self.field_combo_box.currentText():
+            paged = ", paged" if self._listing == UniqueValueEngine.PAGED_LIST else ""
+            self.values_group_box.setTitle(f"Unique Values ({count:,}{paged})")
+        else:
+            self.values_group_box.setTitle("Unique Values")
 
     def clear_table(self):
         """Clear the table of feature attributes."""
-        self.table_widget.setRowCount(0)
+        self.table_group_box.setTitle("Feature Attributes")
+        self.previous_combo_row = None
+        self.table_model.clear()
 
+    @traced
     def populate_table_with_selected_feature(self):
-        """Populate the table with attributes of the selected feature."""
-        self.table_widget.clearContents()
-        if self.layer and len(self.layer.selectedFeatures()) == 1:
-            feature = self.layer.selectedFeatures()[0]
-            fields = self.layer.fields()
-            selected_field = self.field_combo_box.currentText()
-
-            # Set table row count to number of fields + 1 for the Geometry_Type row
-            self.table_widget.setRowCount(len(fields) + 1)
-
-            # Add the Geometry_Type field at the top
-            geometry_type_item = QTableWidgetItem("Geometry_Type")
-            if feature.geometry() and not feature.geometry().isEmpty():
-                geometry_value_item = QTableWidgetItem("Has a Geometry")
-            else:
-                geometry_value_item = QTableWidgetItem("Has No Geometry")
-                geometry_value_item.setBackground(QColor("yellow"))  # Highlight in yellow
-
-            self.table_widget.setItem(0, 0, geometry_type_item)
-            self.table_widget.setItem(0, 1, geometry_value_item)
-
-            # Populate table with field names and values starting from row 1
-            for row, field in enumerate(fields, start=1):
-                field_name_item = QTableWidgetItem(field.name())
-                value_item = QTableWidgetItem(str(feature[field.name()]))
-                self.table_widget.setItem(row, 0, field_name_item)
-                self.table_widget.setItem(row, 1, value_item)
-
-                # Only add radio buttons if the second level selection is enabled
-                if self.second_level_checkbox.isChecked():
-                    # Only add a radio button if the field is not the selected field
-                    if field.name() != selected_field:
-                        radio_button = QRadioButton()
-                        radio_button.setStyleSheet("margin-left:50%; margin-right:50%;")  # Centering the radio button
-                        radio_button.toggled.connect(lambda checked, row=row, field_name=field.name(): 
-                            self.on_radio_button_toggled(checked, row, field_name))
-                        self.radio_button_group.addButton(radio_button)
-                        container = QWidget()
-                        layout = QHBoxLayout(container)
-                        layout.setContentsMargins(0, 0, 0, 0)
-                        layout.addWidget(radio_button, 0, Qt.AlignmentFlag.AlignCenter)
-                        self.table_widget.setCellWidget(row, 2, container)
-                    else:
-                        # If it's the selected field, you can set a placeholder or leave it empty
-                        self.table_widget.setCellWidget(row, 2, QWidget())  # Empty widget or placeholder
-
-    def on_radio_button_toggled(self, checked, row, field_name):
-        """Handle the event when a radio button is toggled."""
-        if checked:
-            # When the radio button is checked, update the value cell to a combo box with unique values
-            self.update_value_cell_to_combo_box(row, field_name)
+        """Populate the table with attributes of the selected feature, or of the first one when all matches are selected."""
+        if self._keep_table_rows:
+            return  # populate_table_with_feature updates the attributes and keeps the combo box
+        count = self._selection().count() if self.layer else 0
+        if count > 1 and self.select_all_checkbox.isChecked():
+            self.table_group_box.setTitle(f"Feature Attributes (first of {count:,} selected)")
+        else:
+            self.table_group_box.setTitle("Feature Attributes")
+        if self.layer and (count == 1 or (count > 1 and self.select_all_checkbox.isChecked())):
+            feature = self._selection().first()
+            self.previous_combo_row = None
+            # The selected field gets no radio button in the Additional Selection column
+            self.table_model.set_feature(self.layer.fields(), feature, self.field_combo_box.currentText())
         else:
-            # When the radio button is unchecked, restore the original value
-            combo_box = self.table_widget.cellWidget(row, 1)
+            self.clear_table()
+
+    def on_selection_row_changed(self, row, previous):
+        """Handle the radio button checked in the Additional Selection column."""
+        if previous >= 0:
+            # Restore the original value of the row that was unchecked
+            combo_box = self.table_widget.indexWidget(self.table_model.index(previous, 1))
             if isinstance(combo_box, QComboBox):
-                current_value = combo_box.currentText()
-                self.restore_original_value(row, current_value)
+                self.restore_original_value(previous, self._combo_value(combo_box))
+        if row >= 0:
+            # Update the value cell to a combo box with unique values
+            self.update_value_cell_to_combo_box(row, self.table_model.field_name(row))
 
     def restore_original_value(self, row, value=None):
         """Restore the original value of the cell, changing the combo box back to a normal cell."""
         if value is None:
             # If no value provided, try to get it from the combo box
-            combo_box = self.table_widget.cellWidget(row, 1)
+            combo_box = self.table_widget.indexWidget(self.table_model.index(row, 1))
             if isinstance(combo_box, QComboBox):
-                value = combo_box.currentText()
+                value = self._combo_value(combo_box)
             else:
-                value = ""
+                return  # No combo box on this row any more
 
-        # Remove the combo box and set plain text
-        self.table_widget.removeCellWidget(row, 1)
-        item = QTableWidgetItem(value)
-        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make it read-only
-        self.table_widget.setItem(row, 1, item)
+        # Remove the combo box and show plain text
+        self.table_widget.setIndexWidget(self.table_model.index(row, 1), None)
+        self.table_model.set_value_text(row, value)
 
     def update_value_cell_to_combo_box(self, row, field_name):
         """Update the value cell to a combo box and handle selection changes."""
         if self.layer and field_name and self.current_list_field and self.current_list_value:
-            # First get features matching the current list selection
-            expr = f'"{self.current_list_field}" = \'{self.current_list_value}\''
-            request = QgsFeatureRequest().setFilterExpression(expr)
-            matching_features = list(self.layer.getFeatures(request))
-            
-            # Get unique values only from the matching features for the selected field
-            unique_values = sorted(set(str(f[field_name]) for f in matching_features if f[field_name] is not None))
-            
             combo_box = QComboBox()
-            combo_box.addItems(unique_values)
             combo_box.setFixedWidth(120)
-            
-            # Get the current value from the cell
-            current_item = self.table_widget.item(row, 1)
-            current_value = current_item.text() if current_item else ""
-            
-            # Set the current value in the combo box if it exists
-            index = combo_box.findText(current_value)
-            if index >= 0:
-                combo_box.setCurrentIndex(index)
-            
-            # Connect the combo box selection change to update feature selection
-            combo_box.currentTextChanged.connect(
-                lambda value, field=field_name: self.on_combo_selection_changed(value, field))
-            
-            self.table_widget.setCellWidget(row, 1, combo_box)
+            self.table_widget.setIndexWidget(self.table_model.index(row, 1), combo_box)
             if self.previous_combo_row is not None and self.previous_combo_row != row:
                 self.restore_original_value(self.previous_combo_row)
             self.previous_combo_row = row
+            if self._facets is None or field_name not in self._facets.counted_fields():
+                self._update_facets()  # Only the field of the combo box is counted
+            self._fill_facet_combo_box(combo_box, row, field_name)
+
+    def _fill_facet_combo_box(self, combo_box, row, field_name):
+        """List the values of field_name among the features of the current list value, with their counts."""
+        combo_box.blockSignals(True)
+        try:
+            combo_box.clear()
+            if self._facets is None:
+                # Filled again by _on_facet_task_finished
+                combo_box.addItem("Counting values...")
+                combo_box.setEnabled(False)
+                return
+            combo_box.setEnabled(True)
+            for value, count in self._facets.values(field_name):
+                combo_box.addItem(f"{value} ({count:,})", value)
+
+            # Set the current value of the cell in the combo box if it exists
+            index = combo_box.findData(self.table_model.value_text(row))
+            if index >= 0:
+                combo_box.setCurrentIndex(index)
+        finally:
+            combo_box.blockSignals(False)
+        # Connect the combo box selection change to update feature selection
+        try:
+            combo_box.currentIndexChanged.disconnect()
+        except TypeError:
+            pass
+        combo_box.currentIndexChanged.connect(
+            lambda index, combo_box=combo_box, field=field_name:
+                self.on_combo_selection_changed(combo_box.itemData(index), field))
+
+    @staticmethod
+    def _combo_value(combo_box):
+        """Raw value of the current combo box item; its text also shows the feature count."""
+        value = combo_box.currentData()
+        return value if value is not None else ""
+
+    def _update_facets(self):
+        """Count the values of the field shown by the 2nd level combo box for the current list value.
+
+        They come from the cache or a background task.
+        """
+        self._cancel_facet_task()
+        self._facets = None
+        if not (self.layer and self.second_level_checkbox.isChecked()
+                and self.current_list_field and self.current_list_value):
+            return
+        counted_fields = self._facet_fields()
+        if self.current_list_value == "NULL" or not counted_fields:
+            # NULL is listed for NULL attributes, which no equality matches; no combo box, nothing to count
+            self._facets = Facets(self.current_list_field, self.current_list_value, {}, 0)
+            return
+        generation = self.unique_value_cache.generation(self.layer)
+        self._facets = self.facet_cache.get(
+            self.layer, self.current_list_field, self.current_list_value, counted_fields, generation)
+        if self._facets is not None:
+            return
+        index = self._current_value_index()
+        feature_ids = index.ids(self.current_list_value, False) if index is not None else None
+        task = FacetTask(self.layer, self.current_list_field, self.current_list_value, counted_fields, feature_ids)
+        task.cache_generation = generation
+        task.taskCompleted.connect(partial(self._on_facet_task_finished, task))
+        task.taskTerminated.connect(partial(self._on_facet_task_finished, task))
+        self._facet_task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _facet_fields(self):
+        """The field of the row showing the 2nd level combo box, in a list; empty when no row shows one."""
+        if self.previous_combo_row is None:
+            return []
+        field_name = self.table_model.field_name(self.previous_combo_row)
+        return [field_name] if field_name and field_name != self.current_list_field else []
+
+    def _cancel_facet_task(self):
+        task = self._facet_task
+        self._facet_task = None
+        if task is not None:
+            try:
+                task.cancel()
+            except RuntimeError:
+                pass  # Task already finished and deleted by the task manager
+
+    def _on_facet_task_finished(self, task):
+        if task is not self._facet_task:
+            return
+        self._facet_task = None
+        if task.facets is None or not self.layer:
+            return
+        self.facet_cache.put(self.layer, task.facets, task.cache_generation)
+        self._facets = task.facets
+        if self.previous_combo_row is not None:
+            combo_box = self.table_widget.indexWidget(self.table_model.index(self.previous_combo_row, 1))
+            if isinstance(combo_box, QComboBox):
+                self._fill_facet_combo_box(
+                    combo_box, self.previous_combo_row, self.table_model.field_name(self.previous_combo_row))
 
     def on_combo_selection_changed(self, value, field_name):
         """Handle when a value is selected in the combo box."""
         if not value or not self.current_list_value or not self.current_list_field:
             return
 
-        # Build expression that combines both conditions
-        expr = f'"{self.current_list_field}" = \'{self.current_list_value}\' AND "{field_name}" = \'{value}\''
-        
+        # Typed filter combining both conditions, compiled by the provider where supported
+        feature_ids, path = self.value_lookup.matching_feature_ids(
+            [(self.current_list_field, self.current_list_value), (field_name, value)])
+        self._log_lookup_path(f"{self.current_list_field} and {field_name}", path)
+
         # Apply the filter
-        self.layer.removeSelection()
-        request = QgsFeatureRequest().setFilterExpression(expr)
-        features = self.layer.getFeatures(request)
-        feature_ids = [f.id() for f in features]
-        
-        if feature_ids:
-            self.layer.selectByIds(feature_ids)
-            # Update the table with the selected feature's attributes
-            feature = next(self.layer.getFeatures(QgsFeatureRequest().setFilterFids(feature_ids)), None)
-            if feature:
-                self.populate_table_with_feature(feature)
-            if self.interact_checkbox.isChecked():
-                self.zoom_to_selected_feature()
+        if not feature_ids:
+            self.layer.removeSelection()
+            return
+        # A model reset would drop the checked row and its combo box
+        self._keep_table_rows = True
+        try:
+            self.layer.selectByIds(feature_ids, Qgis.SelectBehavior.SetSelection)
+        finally:
+            self._keep_table_rows = False
+        # Update the table with the selected feature's attributes
+        feature = self._selection().first()
+        if feature:
+            self.populate_table_with_feature(feature)
+        if self.interact_checkbox.isChecked():
+            self.zoom_to_selected_feature("2nd level selection")
 
+    @traced
     def populate_table_with_feature(self, feature):
         """Populate the table with the feature's attributes while preserving combo boxes."""
         if not feature:
             return
-            
-        fields = self.layer.fields()
-        for row in range(self.table_widget.rowCount()):
-            field_name = self.table_widget.item(row, 0).text()
-            field_idx = fields.indexOf(field_name)
-            if field_idx >= 0:
-                value = str(feature[field_idx])
-                # Check if the cell has a combo box
-                combo_box = self.table_widget.cellWidget(row, 1)
-                if isinstance(combo_box, QComboBox):
-                    # If it's a combo box, update its value
-                    index = combo_box.findText(value)
-                    if index >= 0:
-                        combo_box.setCurrentIndex(index)
-                else:
-                    # If it's not a combo box, update the text
-                    item = QTableWidgetItem(value)
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.table_widget.setItem(row, 1, item)
 
+        self.table_model.update_attributes(feature)
+        if self.previous_combo_row is not None:
+            # The combo box shows the value of its row instead of the cell text
+            combo_box = self.table_widget.indexWidget(self.table_model.index(self.previous_combo_row, 1))
+            if isinstance(combo_box, QComboBox):
+                index = combo_box.findData(self.table_model.value_text(self.previous_combo_row))
+                if index >= 0:
+                    combo_box.blockSignals(True)
+                    combo_box.setCurrentIndex(index)
+                    combo_box.blockSignals(False)
+
+    @traced
     def populate_null_values(self):
         """Populate the table with '--' for all values when the unique value is 'NULL'."""
-        self.table_widget.clearContents()
         if self.layer:
-            fields = self.layer.fields()
-
-            # Set table row count to number of fields + 1 for the Geometry_Type row
-            self.table_widget.setRowCount(len(fields) + 1)
-
-            # Add the Geometry_Type field at the top
-            geometry_type_item = QTableWidgetItem("Geometry_Type")
-            geometry_value_item = QTableWidgetItem("--")
-            self.table_widget.setItem(0, 0, geometry_type_item)
-            self.table_widget.setItem(0, 1, geometry_value_item)
-
-            # Populate table with field names and '--' values starting from row 1
-            for row, field in enumerate(fields, start=1):
-                field_name_item = QTableWidgetItem(field.name())
-                value_item = QTableWidgetItem("--")
-                self.table_widget.setItem(row, 0, field_name_item)
-                self.table_widget.setItem(row, 1, value_item)
-
-                # Center the radio buttons in the "Additional Selection" column
-                radio_button = QRadioButton()
-                radio_button.setStyleSheet("margin-left:50%; margin-right:50%;")  # Centering the radio button
-                radio_button.toggled.connect(lambda checked, row=row, field_name=field.name(): self.on_radio_button_toggled(checked, row, field_name))
-                self.radio_button_group.addButton(radio_button)
-                container = QWidget()
-                layout = QHBoxLayout(container)
-                layout.setContentsMargins(0, 0, 0, 0)
-                layout.addWidget(radio_button, 0, Qt.AlignmentFlag.AlignCenter)
-                self.table_widget.setCellWidget(row, 2, container)
+            self.previous_combo_row = None
+            self.table_model.set_feature(self.layer.fields(), None)
+        else:
+            self.clear_table()
+
+    def pin_facet_field(self):
+        """Pin the field chosen in the Facet Navigator, reading its column in the background when needed."""
+        field_name = self.facet_field_combo_box.currentText()
+        if not self.layer or not field_name or field_name in self._facet_rows or self._column_task is not None:
+            return
+        if not self._facet_columns_current():
+            # The layer changed since the columns were read: read every pinned field again
+            self._start_column_task(list(self._facet_rows) + [field_name])
+        elif field_name in self.facet_navigator.columns:
+            self._add_facet_row(field_name)
+            self._update_facet_rows()
+        else:
+            self._start_column_task([field_name])
+
+    def unpin_facet_field(self, field_name):
+        row_widget, _combo_box = self._facet_rows.pop(field_name)
+        self.facet_rows_layout.removeWidget(row_widget)
+        row_widget.deleteLater()
+        if self.facet_navigator is not None and self.facet_navigator.is_pinned(field_name):
+            had_selection = self.facet_navigator.selected(field_name) is not None
+            self.facet_navigator.unpin(field_name)
+            self._update_facet_rows()
+            if had_selection:
+                self._select_facet_features()
+
+    def on_facet_value_changed(self, field_name, index):
+        """Restrict the features to the value chosen for a facet and select them."""
+        _row_widget, combo_box = self._facet_rows[field_name]
+        if not self._facet_columns_current():
+            self.message_bar.pushMessage(
+                "Facet Navigator", "The layer changed, reading the facet fields again", Qgis.MessageLevel.Info, 3)
+            self._start_column_task(list(self._facet_rows))
+            return
+        self.facet_navigator.select(field_name, combo_box.itemData(index))
+        self._update_facet_rows()
+        self._select_facet_features()
+
+    def _select_facet_features(self):
+        """Select the features satisfying every facet; nothing is selected while no facet restricts them."""
+        navigator = self.facet_navigator
+        if not any(navigator.selected(field_name) is not None for field_name in navigator.facets()):
+            self.layer.removeSelection()
+            return
+        feature_ids = navigator.feature_ids()
+        self.layer.selectByIds(feature_ids, Qgis.SelectBehavior.SetSelection)
+        if feature_ids and self.interact_checkbox.isChecked():
+            self.zoom_to_selected_feature("facet navigator")
+
+    def _facet_columns_current(self):
+        return (self.facet_navigator is not None and self.layer is not None
+                and self.facet_navigator.columns.generation == self.unique_value_cache.generation(self.layer))
+
+    def _add_facet_row(self, field_name):
+        self.facet_navigator.pin(field_name)
+        row_widget = QWidget()
+        row_layout = QHBoxLayout(row_widget)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        name_label = QLabel(field_name)
+        name_label.setFixedWidth(120)
+        row_layout.addWidget(name_label)
+        combo_box = QComboBox()
+        combo_box.currentIndexChanged.connect(partial(self.on_facet_value_changed, field_name))
+        row_layout.addWidget(combo_box, 1)
+        unpin_button = QPushButton("Unpin")
+        unpin_button.setFixedWidth(60)
+        unpin_button.clicked.connect(partial(self.unpin_facet_field, field_name))
+        row_layout.addWidget(unpin_button)
+        self.facet_rows_layout.addWidget(row_widget)
+        self._facet_rows[field_name] = (row_widget, combo_box)
+
+    def _update_facet_rows(self):
+        """Show the current counts in every facet combo box."""
+        navigator = self.facet_navigator
+        for field_name, (_row_widget, combo_box) in self._facet_rows.items():
+            combo_box.blockSignals(True)
+            try:
+                combo_box.clear()
+                combo_box.addItem(f"All ({navigator.available(field_name):,})", None)
+                for label, code, count in navigator.counts(field_name, self._FACET_VALUE_LIMIT):
+                    combo_box.addItem(f"{label} ({count:,})", code)
+                selected = navigator.selected(field_name)
+                combo_box.setCurrentIndex(0 if selected is None else max(0, combo_box.findData(selected)))
+            finally:
+                combo_box.blockSignals(False)
+        if navigator.facets():
+            self.facet_result_label.setText(
+                f"{navigator.matching_count:,} of {len(navigator.columns):,} features match")
+        else:
+            self.facet_result_label.setText("")
+
+    def _start_column_task(self, field_names):
+        """Read the columns of field_names in the background; every pinned facet is rebuilt when the layer changed."""
+        self._cancel_column_task()
+        task = ColumnTask(self.layer, field_names)
+        task.cache_generation = self.unique_value_cache.generation(self.layer)
+        task.taskCompleted.connect(partial(self._on_column_task_finished, task))
+        task.taskTerminated.connect(partial(self._on_column_task_finished, task))
+        self._column_task = task
+        self.facet_pin_button.setEnabled(False)
+        self.facet_result_label.setText(f"Reading {', '.join(field_names)}...")
+        QgsApplication.taskManager().addTask(task)
+
+    def _cancel_column_task(self):
+        task = self._column_task
+        self._column_task = None
+        self.facet_pin_button.setEnabled(True)
+        if task is not None:
+            try:
+                task.cancel()
+            except RuntimeError:
+                pass  # Task already finished and deleted by the task manager
+
+    def _on_column_task_finished(self, task):
+        if task is not self._column_task:
+            return
+        self._column_task = None
+        self.facet_pin_button.setEnabled(True)
+        if task.columns is None or not self.layer:
+            self.facet_result_label.setText("")
+            return
+        if task.cache_generation != self.unique_value_cache.generation(self.layer):
+            self.facet_result_label.setText("The layer changed while it was read, pin the field again")
+            return
+        if not self._facet_columns_current():
+            # First facet, or the layer changed: start over from the fields just read
+            self._reset_facet_navigator()
+            columns = ColumnarCache(task.cache_generation)
+            columns.add_columns(task.feature_ids, task.columns)
+            self.facet_navigator = FacetNavigator(columns)
+        elif not self.facet_navigator.columns.add_columns(task.feature_ids, task.columns):
+            self.facet_result_label.setText("The layer changed while it was read, pin the field again")
+            return
+        for field_name in task.field_names:
+            if field_name not in self._facet_rows:
+                self._add_facet_row(field_name)
+        self._update_facet_rows()
+
+    def _reset_facet_navigator(self):
+        """Unpin every facet, e.g. when the layer changes."""
+        self._cancel_column_task()
+        for row_widget, _combo_box in self._facet_rows.values():
+            self.facet_rows_layout.removeWidget(row_widget)
+            row_widget.deleteLater()
+        self._facet_rows = {}
+        self.facet_navigator = None
+        self.facet_result_label.setText("")
 
     def _load_synthetic_square_size(self):
         settings = QSettings()
@@ -750,6 +1534,20 @@ class EasyFeatureSelectionDialog(QDialog):
             value = self._DEFAULT_SQUARE_SIZE
         return max(1, min(self._MAX_SQUARE_SIZE, value))
 
+    def _load_int_setting(self, key, default):
+        settings = QSettings()
+        settings.beginGroup(self._SETTINGS_GROUP)
+        value = settings.value(key, default)
+        settings.endGroup()
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = default
+        return max(0, value)
+
+    def _load_cache_budget_mb(self):
+        return self._load_int_setting(self._CACHE_BUDGET_KEY, self._DEFAULT_CACHE_BUDGET_MB)
+
     def _save_synthetic_square_size(self, value):
         settings = QSettings()
         settings.beginGroup(self._SETTINGS_GROUP)
@@ -759,13 +1557,19 @@ class EasyFeatureSelectionDialog(QDialog):
     def check_interactive_selection(self):
         """Handle the interactive zoom and pan feature."""
         if self.interact_checkbox.isChecked():
-            self.zoom_to_selected_feature()
+            self.zoom_to_selected_feature("interactive toggle")
 
     def update_zoom_label(self, value):
-        """Update the zoom label and zoom to the selected features."""
+        """Update the zoom label; the zoom follows on release or once the value stops changing."""
         self.zoom_label.setText(f"Select zoom level: {value}%")
+        if self.interact_checkbox.isChecked() and not self.zoom_slider.isSliderDown():
+            self._slider_zoom_timer.start()
+
+    def apply_slider_zoom(self):
+        """Zoom to the selected features at the zoom level of the slider."""
+        self._slider_zoom_timer.stop()
         if self.interact_checkbox.isChecked():
-            self.zoom_to_selected_feature()
+            self.zoom_to_selected_feature("zoom slider")
 
     def on_synthetic_square_changed(self):
         enabled = self.synthetic_square_checkbox.isChecked()
@@ -859,9 +1663,9 @@ class EasyFeatureSelectionDialog(QDialog):
             center.y() + half_height,
         )
 
-    def _synthetic_point_base_extent(self, geometry, transform, pixel_side, mupp):
+    def _synthetic_point_base_extent(self, point, transform, pixel_side, mupp):
         half_side = (pixel_side / 2.0) * mupp
-        center = transform.transform(geometry.centroid().asPoint())
+        center = transform.transform(point)
         return QgsRectangle(
             center.x() - half_side,
             center.y() - half_side,
@@ -869,9 +1673,9 @@ class EasyFeatureSelectionDialog(QDialog):
             center.y() + half_side,
         )
 
-    def _compute_synthetic_base_extent(self, geometry, transform):
+    def _compute_synthetic_base_extent(self, point, transform):
         extent = self._synthetic_point_base_extent(
-            geometry,
+            point,
             transform,
             self.synthetic_square_size_spinner.value(),
             self._get_mupp_for_synthetic_square(),
@@ -879,33 +1683,32 @@ class EasyFeatureSelectionDialog(QDialog):
         self._synthetic_base_extent = extent
         return extent
 
-    def _get_synthetic_base_extent(self, geometry, transform):
-        center = transform.transform(geometry.centroid().asPoint())
+    def _get_synthetic_base_extent(self, point, transform):
+        center = transform.transform(point)
         if self._synthetic_base_extent is not None:
             cached_center = self._synthetic_base_extent.center()
             if (abs(cached_center.x() - center.x()) < 1e-9
                     and abs(cached_center.y() - center.y()) < 1e-9):
                 return self._synthetic_base_extent
-        return self._compute_synthetic_base_extent(geometry, transform)
+        return self._compute_synthetic_base_extent(point, transform)
 
     def _refresh_synthetic_square(self):
         """Redraw the synthetic square rubber band only; does not change map extent."""
         if not self.synthetic_square_checkbox.isChecked() or not self.layer:
             self._clear_synthetic_square_band()
             return None
-        if self.layer.selectedFeatureCount() != 1:
+        if self._selection().count() != 1:
             self._clear_synthetic_square_band()
             return None
 
-        geometry = self.layer.selectedFeatures()[0].geometry()
-        if geometry is None or geometry.isEmpty() or not self._is_point_like_geometry(geometry):
+        bbox = self._selection().extent()
+        if not self._has_extent(bbox) or not self._is_point_like_extent(bbox):
             self._clear_synthetic_square_band()
             return None
 
-        canvas_crs = iface.mapCanvas().mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(self.layer.crs(), canvas_crs, QgsProject.instance())
+        transform = self._layer_to_canvas_transform()
         extent = self._synthetic_point_base_extent(
-            geometry,
+            bbox.center(),
             transform,
             self.synthetic_square_size_spinner.value(),
             self._visual_mupp(),
@@ -913,45 +1716,74 @@ class EasyFeatureSelectionDialog(QDialog):
         self._update_synthetic_square_band(extent)
         return extent
 
-    def _is_point_like_geometry(self, geometry):
-        bbox = geometry.boundingBox()
+    def _layer_to_canvas_transform(self):
+        """Cached transform from the layer CRS to the canvas CRS."""
+        return self.transform_cache.transform(self.layer.crs(), iface.mapCanvas().mapSettings().destinationCrs())
+
+    @staticmethod
+    def _has_extent(bbox):
+        """False for the null rectangle of features without geometry; a point at 0,0 still has an extent."""
+        return bbox.isFinite() and bbox.xMinimum() <= bbox.xMaximum() and bbox.yMinimum() <= bbox.yMaximum()
+
+    def _is_point_like_extent(self, bbox):
+        """Whether the extent of the selected feature is a single point of a point layer."""
         if bbox.width() > 0 or bbox.height() > 0:
             return False
-        return geometry.type() == Qgis.GeometryType.Point
-
-    def zoom_to_selected_feature(self):
-        """Adjust the zoom level based on the slider value and zoom to the selected feature, accounting for CRS."""
-        if self.layer and len(self.layer.selectedFeatures()) == 1:
-            feature = self.layer.selectedFeatures()[0]
-            geometry = feature.geometry()
-            if geometry is None or geometry.isEmpty():
+        return self.layer.geometryType() == Qgis.GeometryType.Point
+
+    @traced
+    def zoom_to_selected_feature(self, action="selection"):
+        """Adjust the zoom level based on the slider value and zoom to the selected feature, accounting for CRS.
+
+        action names the user action in the render counts of the zoom pipeline.
+        """
+        if self.layer and self._selection().count() > 1:
+            self._zoom_to_selection_extent(action)
+        elif self.layer and self._selection().count() == 1:
+            # The extent comes from the bounding box cache when it is filled, the geometry is not needed
+            bbox = self._selection().extent()
+            if not self._has_extent(bbox):
                 return
 
-            canvas_crs = iface.mapCanvas().mapSettings().destinationCrs()
-            layer_crs = self.layer.crs()
-            transform = QgsCoordinateTransform(layer_crs, canvas_crs, QgsProject.instance())
+            transform = self._layer_to_canvas_transform()
             zoom_factor = (100 - self.zoom_slider.value()) / 100.0
             use_synthetic = (
                 self.synthetic_square_checkbox.isChecked()
-                and self._is_point_like_geometry(geometry)
+                and self._is_point_like_extent(bbox)
             )
 
             if use_synthetic:
                 pixel_side = self.synthetic_square_size_spinner.value()
-                base_extent = self._get_synthetic_base_extent(geometry, transform)
+                base_extent = self._get_synthetic_base_extent(bbox.center(), transform)
                 self._update_synthetic_square_band(base_extent)
                 extent = self._extent_with_zoom_buffer(base_extent, zoom_factor)
                 extent = self._clamp_extent_to_layer(extent)
             else:
                 self._clear_synthetic_square_band()
-                extent = transform.transformBoundingBox(geometry.boundingBox())
+                extent = transform.transformBoundingBox(bbox)
                 extent = self._extent_with_zoom_buffer(extent, zoom_factor)
 
-            iface.mapCanvas().setExtent(extent)
-            iface.mapCanvas().refresh()
+            self.zoom_pipeline.zoom_to(extent, action)
             if use_synthetic:
                 self._sync_reference_mupp(base_extent, pixel_side)
 
+    def _zoom_to_selection_extent(self, action):
+        """Zoom to the combined bounding box of every selected feature; their geometries are not kept."""
+        extent = self._selection().extent()
+        if not self._has_extent(extent):
+            return
+        self._clear_synthetic_square_band()
+        extent = self._layer_to_canvas_transform().transformBoundingBox(extent)
+        zoom_factor = (100 - self.zoom_slider.value()) / 100.0
+        self.zoom_pipeline.zoom_to(self._extent_with_zoom_buffer(extent, zoom_factor), action)
+
+    def toggle_select_all_matches(self, state):
+        """Select the matches of the current list value again, all of them or the first one."""
+        current = self.unique_values_list.currentIndex()
+        if self.layer and current.isValid():
+            self._cancel_pending_highlight()
+            self.highlight_features(current.row())
+
     def toggle_two_way_selection(self, state):
         """Toggle two-way selection functionality and clear the search box when enabled."""
         checked = (state == Qt.CheckState.Checked)
@@ -968,21 +1800,87 @@ class EasyFeatureSelectionDialog(QDialog):
 
     def update_listbox_with_selection(self):
         """Update the unique values list box when a feature is selected on the map canvas."""
-        if self.layer and self.layer.selectedFeatureCount() == 1:
-            feature = self.layer.selectedFeatures()[0]
+        if self.layer and self._selection().count() == 1:
+            feature = self._selection().first()
             field_name = self.field_combo_box.currentText()
             if field_name:
                 value = str(feature[field_name])
-                items = self.unique_values_list.findItems(value, Qt.MatchFlag.MatchExactly)
-                if items:
-                    self.unique_values_list.setCurrentItem(items[0])
+                row = self.unique_values_model.find(value)
+                if row >= 0:
+                    self.unique_values_list.setCurrentIndex(self.unique_values_model.index(row))
+
+    def on_search_text_changed(self, text):
+        """Restart the search debounce, filter_values runs once typing pauses."""
+        self._search_timer.start()
+
+    def toggle_fuzzy_search(self, state):
+        """Switch between substring filtering and similarity ranking of the unique values."""
+        checked = (state == Qt.CheckState.Checked)
+        values = self.search_engine.values()
+        if checked and values and not self.search_engine.has_index() and self._trigram_task is None:
+            # Fuzzy candidates come from the trigram index, whatever the list size
+            self._start_trigram_task(values)
+        self.filter_values()
 
+    @traced
     def filter_values(self):
         """Filter the unique values in the list based on the search text."""
-        search_text = self.search_box.text().lower()
-        for i in range(self.unique_values_list.count()):
-            item = self.unique_values_list.item(i)
-            item.setHidden(search_text not in item.text().lower())
+        self._search_timer.stop()
+        if self._listing == UniqueValueEngine.SEARCH_ONLY:
+            self._start_value_search(self.search_box.text())
+            return
+        if self.fuzzy_search_checkbox.isChecked():
+            rows = self.search_engine.fuzzy_search(self.search_box.text())
+            ordered = False  # Best match first
+        else:
+            rows = self.search_engine.search(self.search_box.text())
+            ordered = True
+        if rows is None and not self.unique_values_model.is_filtered():
+            return
+        current_value = self._current_list_item_value()
+        self.unique_values_model.set_filter(rows, ordered)
+        self._restore_current_value(current_value)
+
+    def _start_value_search(self, text):
+        """List the values containing text in the background, the field has too many values to list."""
+        self._cancel_value_search_task()
+        field_name = self.field_combo_box.currentText()
+        if not text or not self.layer or not field_name:
+            self._show_searched_values((), True)
+            return
+        task = ValueSearchTask(self.layer, field_name, text, self._SEARCH_ONLY_LIMIT)
+        task.taskCompleted.connect(partial(self._on_value_search_finished, task))
+        task.taskTerminated.connect(partial(self._on_value_search_finished, task))
+        self._value_search_task = task
+        self._update_unique_values_title()
+        QgsApplication.taskManager().addTask(task)
+
+    def _cancel_value_search_task(self):
+        task = self._value_search_task
+        self._value_search_task = None
+        if task is not None:
+            try:
+                task.cancel()
+            except RuntimeError:
+                pass  # Task already finished and deleted by the task manager
+
+    def _on_value_search_finished(self, task):
+        if task is not self._value_search_task:
+            return
+        self._value_search_task = None
+        if task.values is None:
+            self._update_unique_values_title()  # Failed, reported by the task
+            return
+        self._show_searched_values(task.values, task.complete)
+
+    def _show_searched_values(self, values, complete):
+        """List search results in search-only mode; they replace the values instead of filtering them."""
+        current_value = self._current_list_item_value()
+        self._search_complete = complete
+        self.unique_values_model.set_values(values)
+        self.search_engine.set_values(self.unique_values_model.values())
+        self._restore_current_value(current_value)
+        self._update_unique_values_title()
 
     def toggle_dynamic_layer_selection(self, state):
         """Enable or disable dynamic layer selection based on the checkbox state."""
@@ -1001,17 +1899,9 @@ class EasyFeatureSelectionDialog(QDialog):
         """Toggle the visibility of the Additional Selection column and clear all radio buttons."""
         checked = (state == Qt.CheckState.Checked)
         if checked:
-            self.table_widget.setColumnCount(3)
-            self.table_widget.setHorizontalHeaderLabels(["Field Name", "Value", "Additional Selection"])
-            
-            # Restore bold header font
-            header_font = QFont()
-            header_font.setBold(True)
-            for i in range(self.table_widget.columnCount()):
-                header_item = QTableWidgetItem(self.table_widget.horizontalHeaderItem(i).text())
-                header_item.setFont(header_font)
-                self.table_widget.setHorizontalHeaderItem(i, header_item)
-            
+            self.table_model.set_selection_column(True)
+            self._update_facets()
+
             # Restore column widths
             self.table_widget.setColumnWidth(1, 120)  # Value column
             self.table_widget.setColumnWidth(2, 200)  # Additional Selection column
@@ -1020,29 +1910,14 @@ class EasyFeatureSelectionDialog(QDialog):
             self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
             self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
             self.table_widget.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-            
-            # Restore radio buttons if there's a selected feature
-            if self.layer and len(self.layer.selectedFeatures()) == 1:
-                self.populate_table_with_selected_feature()
         else:
-            # Clear all radio button selections
-            self.radio_button_group.setExclusive(False)
-            for button in self.radio_button_group.buttons():
-                button.setChecked(False)
-            self.radio_button_group.setExclusive(True)
-            
+            # Clear the radio button selection
+            self.table_model.set_selection_row(-1)
+
             # Hide the column
-            self.table_widget.setColumnCount(2)
-            self.table_widget.setHorizontalHeaderLabels(["Field Name", "Value"])
-            
-            # Restore bold header font for remaining columns
-            header_font = QFont()
-            header_font.setBold(True)
-            for i in range(self.table_widget.columnCount()):
-                header_item = QTableWidgetItem(self.table_widget.horizontalHeaderItem(i).text())
-                header_item.setFont(header_font)
-                self.table_widget.setHorizontalHeaderItem(i, header_item)
-            
+            self.table_model.set_selection_column(False)
+            self._cancel_facet_task()
+
             # Restore column widths and resize modes for remaining columns
             self.table_widget.setColumnWidth(1, 120)
             self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
@@ -1055,63 +1930,117 @@ class EasyFeatureSelectionDialog(QDialog):
 
     def _select_feature_ids_by_field_value(self, field_name, value, first_only=True):
         """Match features the same way unique values are listed (string comparison)."""
-        field_idx = self.layer.fields().indexOf(field_name)
-        if field_idx < 0:
-            return []
-
-        feature_ids = []
-        for feature in self.layer.getFeatures():
-            field_value = feature[field_idx]
-            if value == "NULL":
-                if field_value is None:
-                    feature_ids.append(feature.id())
-            elif field_value is not None and str(field_value) == value:
-                feature_ids.append(feature.id())
-            if first_only and feature_ids:
-                break
+        index = self._current_value_index()
+        if index is not None:
+            feature_ids, path = index.ids(value, first_only), "index"
+        else:
+            feature_ids, path = self.value_lookup.feature_ids(field_name, value, first_only)
+        self._log_lookup_path(field_name, path)
         return feature_ids
 
+    def _log_lookup_path(self, field_name, path):
+        """Log the lookup path whenever it differs from the previous lookup."""
+        if (field_name, path) == self._last_lookup_path:
+            return
+        self._last_lookup_path = (field_name, path)
+        QgsMessageLog.logMessage(
+            f"Selecting features of {self.layer.name()} by {field_name} through the {path} path",
+            "Easy Feature Selector", Qgis.MessageLevel.Info)
+
+    def on_current_value_changed(self, current, previous):
+        """Forward the current row of the Unique Values list to highlight_features."""
+        self.highlight_features(current.row())
+
+    @traced
     def highlight_features(self, current_row):
-        """Highlight features in the layer based on the selected unique value."""
+        """Highlight features in the layer based on the selected unique value.
+
+        The first move of the list is applied at once. While moves keep
+        coming faster than _BROWSE_SETTLE_MS, only the table follows
+        immediately, when the value index makes the lookup cheap; the
+        lookup without index, the facet counts and the canvas are updated
+        once for the last value browsed to.
+        """
         if current_row < 0 or not self.layer:
             return
 
-        item = self.unique_values_list.item(current_row)
-        if not item:
+        value = self.unique_values_model.value(current_row)
+        if value is None:
             return
 
         self._synthetic_base_extent = None
-        self.current_list_value = item.text()
+        self.current_list_value = value
         self.current_list_field = self.field_combo_box.currentText()
 
         if self.current_list_value == "NULL":
+            self._cancel_pending_highlight()
+            self._update_facets()
             self.layer.blockSignals(True)
             try:
                 self.layer.removeSelection()
             finally:
                 self.layer.blockSignals(False)
+            self._invalidate_selection_snapshot()
             self.populate_null_values()
             self._clear_synthetic_square_band()
             return
 
+        if not self._browse_timer.isActive():
+            self._pending_highlight = None
+            self._select_list_value(self.current_list_field, self.current_list_value)
+            self._update_facets()
+            self._update_canvas_for_list_value()
+        else:
+            # Facets of the previous value no longer apply, they are counted once browsing settles
+            self._cancel_facet_task()
+            self._facets = None
+            if self._current_value_index() is not None:
+                self._select_list_value(self.current_list_field, self.current_list_value)
+                self._pending_highlight = (self.current_list_field, self.current_list_value, True)
+            else:
+                # Each lookup would scan the layer: only the last value browsed to is looked up
+                self._pending_highlight = (self.current_list_field, self.current_list_value, False)
+        self._browse_timer.start()
+
+    def _on_browsing_settled(self):
+        pending = self._pending_highlight
+        self._pending_highlight = None
+        if pending is None or not self.layer or pending[:2] != (self.current_list_field, self.current_list_value):
+            return
+        field_name, value, selected = pending
+        if not selected:
+            self._select_list_value(field_name, value)
+        self._update_facets()
+        self._update_canvas_for_list_value()
+
+    def _cancel_pending_highlight(self):
+        self._browse_timer.stop()
+        self._pending_highlight = None
+
+    def _select_list_value(self, field_name, value):
+        """Select the features listed as value and show them in the table."""
         feature_ids = self._select_feature_ids_by_field_value(
-            self.current_list_field, self.current_list_value)
+            field_name, value, first_only=not self.select_all_checkbox.isChecked())
 
         self.layer.blockSignals(True)
         try:
-            self.layer.removeSelection()
-            if feature_ids:
-                self.layer.selectByIds(feature_ids)
+            self.layer.selectByIds(feature_ids, Qgis.SelectBehavior.SetSelection)
         finally:
             self.layer.blockSignals(False)
+        self._invalidate_selection_snapshot()
 
         if feature_ids:
             self.populate_table_with_selected_feature()
+        else:
+            self.clear_table()
+
+    def _update_canvas_for_list_value(self):
+        """Draw the synthetic square and zoom to the selection made by _select_list_value."""
+        if self._selection().count():
             self._refresh_synthetic_square()
             if self.interact_checkbox.isChecked():
-                self.zoom_to_selected_feature()
+                self.zoom_to_selected_feature("unique value")
         else:
-            self.clear_table()
             self._clear_synthetic_square_band()
 
     def copy_table_data_to_clipboard(self):
@@ -1119,14 +2048,11 @@ class EasyFeatureSelectionDialog(QDialog):
         clipboard = QApplication.clipboard()
         table_data = []
 
-        for row in range(self.table_widget.rowCount()):
+        for row in range(self.table_model.rowCount()):
             row_data = []
-            for col in range(self.table_widget.columnCount()):
-                item = self.table_widget.item(row, col)
-                if item is not None:
-                    row_data.append(item.text())
-                else:
-                    row_data.append("")
+            for col in range(self.table_model.columnCount()):
+                text = self.table_model.index(row, col).data()
+                row_data.append(text if text is not None else "")
             table_data.append("\t".join(row_data))
 
         clipboard_text = "\n".join(table_data)
@@ -1137,7 +2063,57 @@ class EasyFeatureSelectionDialog(QDialog):
         # Emit signal to close plugin and uncheck toggle
         self.closingPlugin.emit()  
 
+    def _trace_args(self):
+        """Feature counts attached to every traced span."""
+        if not self.layer or isinstance(self.layer, QgsRasterLayer):
+            return {}
+        return {"layer": self.layer.name(), "features": self.layer.featureCount(),
+                "selected": self.layer.selectedFeatureCount()}
+
+    def _dump_trace(self):
+        """Write the spans recorded so far as Chrome trace JSON, when tracing is enabled."""
+        if not tracer.enabled or not len(tracer):
+            return
+        settings = QSettings()
+        settings.beginGroup(self._SETTINGS_GROUP)
+        path = settings.value(self._TRACE_FILE_KEY, "") or os.path.join(
+            QgsApplication.qgisSettingsDirPath(), "easyfeatureselection_trace.json")
+        settings.endGroup()
+        try:
+            count = tracer.dump(path)
+        except OSError as e:
+            QgsMessageLog.logMessage(f"Could not write the trace to {path}: {e}",
+                                     "Easy Feature Selector", Qgis.MessageLevel.Warning)
+            return
+        tracer.clear()
+        QgsMessageLog.logMessage(f"{count} trace spans written to {path}",
+                                 "Easy Feature Selector", Qgis.MessageLevel.Info)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._relist_on_show:
+            # The dialog is reopened, not rebuilt: list the values the interrupted scan left out
+            self._relist_on_show = False
+            self.update_unique_values()
+
     def closeEvent(self, event):
+        self._relist_on_show = (self.listing_in_progress() or self.value_multiset is not None
+                                or self._value_search_task is not None)
+        self._cancel_unique_value_task()
+        self._cancel_trigram_task()
+        self._cancel_pending_highlight()
+        self._cancel_facet_task()
+        self._cancel_column_task()
+        self._cancel_bbox_task()
+        self._stop_value_multiset()
+        self._cancel_value_search_task()
+        self._slider_zoom_timer.stop()
+        QgsMessageLog.logMessage(self.unique_value_cache.stats_text(), "Easy Feature Selector", Qgis.MessageLevel.Info)
+        QgsMessageLog.logMessage(self.disk_cache.stats_text(), "Easy Feature Selector", Qgis.MessageLevel.Info)
+        self.disk_cache.close()
+        QgsMessageLog.logMessage(self.transform_cache.stats_text(), "Easy Feature Selector", Qgis.MessageLevel.Info)
+        QgsMessageLog.logMessage(self.zoom_pipeline.stats_text(), "Easy Feature Selector", Qgis.MessageLevel.Info)
+        self._dump_trace()
         self._clear_synthetic_square_band()
         event.accept()
         self.hide()
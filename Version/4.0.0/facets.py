@@ -0,0 +1,347 @@
+from array import array
+from collections import Counter, OrderedDict
+
+from qgis.core import QgsFeatureRequest, QgsMessageLog, QgsTask, QgsVectorLayerFeatureSource, Qgis
+
+from .filters import ValueLookup
+from .unique_values import value_key
+
+
+class Facets:
+    """Distinct values and their feature counts of the shown fields, among the features of one first-level value."""
+
+    def __init__(self, field_name, value, counts, feature_count):
+        self.field_name = field_name
+        self.value = value
+        self.feature_count = feature_count
+        self._counts = counts  # Field name -> Counter of listed value -> feature count
+
+    def counted_fields(self):
+        return tuple(self._counts)
+
+    def values(self, field_name):
+        """Return [(value, count)] sorted by value; NULL attributes are not counted."""
+        counts = self._counts.get(field_name)
+        return sorted(counts.items()) if counts else []
+
+    def count(self, field_name, value):
+        counts = self._counts.get(field_name)
+        return counts.get(value, 0) if counts else 0
+
+
+class FacetTask(QgsTask):
+    """Count the values of the shown fields among the features listed as value, in one background pass.
+
+    Only those fields are read, not every column of wide layers.
+    """
+
+    def __init__(self, layer, field_name, value, counted_fields, feature_ids=None):
+        super().__init__(f"Counting values for {field_name} = {value}", QgsTask.Flag.CanCancel)
+        self.field_name = field_name
+        self.value = value
+        self.facets = None
+        self.exception = None
+        fields = layer.fields()
+        self.field_index = fields.indexOf(field_name)
+        self.field_names = [name for name in counted_fields if name != field_name and fields.indexOf(name) >= 0]
+        self.field_indexes = [fields.indexOf(name) for name in self.field_names]
+        # Requests are built here, on the main thread; the source is safe to read in run()
+        if feature_ids is not None:
+            self.request = QgsFeatureRequest().setFilterFids(list(feature_ids))
+            self.compare = False
+        else:
+            self.request = ValueLookup(layer).equality_request(field_name, value)
+            self.compare = self.request is None
+            if self.compare:
+                self.request = QgsFeatureRequest()
+        self.request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        self.request.setSubsetOfAttributes(self.field_indexes + ([self.field_index] if self.compare else []))
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.setDependentLayers([layer])
+
+    def run(self):
+        try:
+            counters = [Counter() for _name in self.field_names]
+            feature_count = 0
+            for read, feature in enumerate(self.source.getFeatures(self.request), start=1):
+                if read % 1000 == 0 and self.isCanceled():
+                    return False
+                attributes = feature.attributes()
+                if self.compare and value_key(attributes[self.field_index]) != self.value:
+                    continue
+                feature_count += 1
+                for counter, field_index in zip(counters, self.field_indexes):
+                    key = value_key(attributes[field_index])
+                    if key is not None:
+                        counter[key] += 1
+            counts = dict(zip(self.field_names, counters))
+            self.facets = Facets(self.field_name, self.value, counts, feature_count)
+        except Exception as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def finished(self, result):
+        if self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Counting values for {self.field_name} = {self.value} failed: {self.exception}",
+                "Easy Feature Selector", Qgis.MessageLevel.Warning)
+
+
+class FacetCache:
+    """Small LRU of Facets keyed by (layer id, subset string, field name, value, counted fields).
+
+    Entries carry the UniqueValueCache generation of the layer they were
+    counted at and are ignored once the layer changed.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (generation, Facets)
+
+    @staticmethod
+    def key(layer, field_name, value, counted_fields):
+        return (layer.id(), layer.subsetString(), field_name, value, tuple(counted_fields))
+
+    def get(self, layer, field_name, value, counted_fields, generation):
+        key = self.key(layer, field_name, value, counted_fields)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != generation:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, layer, facets, generation):
+        key = self.key(layer, facets.field_name, facets.value, facets.counted_fields())
+        self._entries[key] = (generation, facets)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ColumnarCache:
+    """Dictionary-encoded columns of the fields pinned as facets, shared by every facet of one layer.
+
+    Each column holds one integer code per feature, in the order of
+    feature_ids; labels[code] is the value as the Unique Values list shows
+    it, with NULL attributes listed as NULL.
+    """
+
+    NULL_LABEL = "NULL"
+
+    def __init__(self, generation=None):
+        self.generation = generation  # UniqueValueCache generation of the layer the columns were read at
+        self.feature_ids = None
+        self._codes = {}  # Field name -> array('l') of codes
+        self._labels = {}  # Field name -> list of labels
+
+    def __len__(self):
+        return len(self.feature_ids) if self.feature_ids is not None else 0
+
+    def __contains__(self, field_name):
+        return field_name in self._codes
+
+    def codes(self, field_name):
+        return self._codes[field_name]
+
+    def labels(self, field_name):
+        return self._labels[field_name]
+
+    def add_columns(self, feature_ids, columns):
+        """Add {field name: (codes, labels)} read in the order of feature_ids.
+
+        Returns False when feature_ids are not the features of the columns
+        already held, i.e. the layer changed between the two reads.
+        """
+        if self.feature_ids is None:
+            self.feature_ids = feature_ids
+        elif feature_ids != self.feature_ids:
+            positions = {feature_id: position for position, feature_id in enumerate(feature_ids)}
+            if len(positions) != len(self.feature_ids) or any(
+                    feature_id not in positions for feature_id in self.feature_ids):
+                return False
+            order = [positions[feature_id] for feature_id in self.feature_ids]
+            columns = {name: (array('l', (codes[position] for position in order)), labels)
+                       for name, (codes, labels) in columns.items()}
+        for name, (codes, labels) in columns.items():
+            self._codes[name] = codes
+            self._labels[name] = labels
+        return True
+
+
+class ColumnTask(QgsTask):
+    """Read and dictionary-encode the columns of some fields in one NoGeometry pass."""
+
+    def __init__(self, layer, field_names):
+        super().__init__(f"Reading {', '.join(field_names)} for the facet navigator", QgsTask.Flag.CanCancel)
+        self.field_names = list(field_names)
+        self.feature_ids = array('q')
+        self.columns = None
+        self.exception = None
+        fields = layer.fields()
+        self.field_indexes = [fields.indexOf(field_name) for field_name in self.field_names]
+        self.request = QgsFeatureRequest()
+        self.request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        self.request.setSubsetOfAttributes(self.field_indexes)
+        self.total = max(layer.featureCount(), 0)
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.setDependentLayers([layer])
+
+    def run(self):
+        try:
+            encoders = [{} for _name in self.field_names]  # Value key -> code
+            columns = [array('l') for _name in self.field_names]
+            feature_ids = self.feature_ids
+            for read, feature in enumerate(self.source.getFeatures(self.request), start=1):
+                feature_ids.append(feature.id())
+                for field_index, encoder, codes in zip(self.field_indexes, encoders, columns):
+                    key = value_key(feature[field_index])
+                    code = encoder.get(key)
+                    if code is None:
+                        code = encoder[key] = len(encoder)
+                    codes.append(code)
+                if read % 10000 == 0:
+                    if self.isCanceled():
+                        return False
+                    if self.total:
+                        self.setProgress(min(100.0, 100.0 * read / self.total))
+            self.columns = {}
+            for name, encoder, codes in zip(self.field_names, encoders, columns):
+                labels = [None] * len(encoder)
+                for key, code in encoder.items():
+                    labels[code] = ColumnarCache.NULL_LABEL if key is None else key
+                self.columns[name] = (codes, labels)
+        except Exception as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def finished(self, result):
+        if self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Reading {', '.join(self.field_names)} for the facet navigator failed: {self.exception}",
+                "Easy Feature Selector", Qgis.MessageLevel.Warning)
+
+
+class FacetNavigator:
+    """Drill down through any number of facets, each restricting the features to one value of a field.
+
+    For every feature the number of facet selections it does not satisfy
+    is kept, so changing the selection of one facet only touches the
+    features whose status for that facet flips. The counts of a facet are
+    over the features satisfying every other facet, and are updated from the
+    same flips instead of being counted again.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.matching_count = len(columns)
+        self._facets = []  # Pinned field names, in pinning order
+        self._selected = {}  # Field name -> selected code, None for every value
+        self._counts = {}  # Field name -> Counter of code -> matching features
+        self._postings = {}  # Field name -> {code: array('l') of rows}
+        self._violations = array('l', bytes(array('l').itemsize * len(columns)))
+
+    def facets(self):
+        return list(self._facets)
+
+    def is_pinned(self, field_name):
+        return field_name in self._selected
+
+    def pin(self, field_name):
+        """Add a facet on a field whose column is in the ColumnarCache, selecting every value."""
+        if field_name in self._selected:
+            return
+        codes = self.columns.codes(field_name)
+        postings = {}
+        for row, code in enumerate(codes):
+            posting = postings.get(code)
+            if posting is None:
+                postings[code] = array('l', (row,))
+            else:
+                posting.append(row)
+        violations = self._violations
+        self._postings[field_name] = postings
+        self._counts[field_name] = Counter(
+            {code: sum(1 for row in rows if not violations[row]) for code, rows in postings.items()})
+        self._selected[field_name] = None
+        self._facets.append(field_name)
+
+    def unpin(self, field_name):
+        if field_name not in self._selected:
+            return
+        self.select(field_name, None)
+        self._facets.remove(field_name)
+        del self._selected[field_name]
+        del self._counts[field_name]
+        del self._postings[field_name]
+
+    def selected(self, field_name):
+        return self._selected.get(field_name)
+
+    def available(self, field_name):
+        """Number of features satisfying every facet but field_name."""
+        return sum(self._counts[field_name].values())
+
+    def select(self, field_name, code):
+        """Restrict a facet to the features with value code, None lifts the restriction."""
+        previous = self._selected[field_name]
+        if code == previous:
+            return
+        postings = self._postings[field_name]
+        if previous is None:
+            for other, rows in postings.items():
+                if other != code:
+                    self._flip(rows, field_name, 1)
+        elif code is None:
+            for other, rows in postings.items():
+                if other != previous:
+                    self._flip(rows, field_name, -1)
+        else:
+            self._flip(postings.get(previous, ()), field_name, 1)
+            self._flip(postings.get(code, ()), field_name, -1)
+        self._selected[field_name] = code
+
+    def counts(self, field_name, limit=None):
+        """Return [(label, code, count)] of a facet, most frequent first; the selected value is always listed."""
+        labels = self.columns.labels(field_name)
+        counts = self._counts[field_name]
+        items = sorted(((count, code) for code, count in counts.items() if count > 0),
+                       key=lambda item: (-item[0], labels[item[1]]))
+        if limit is not None:
+            items = items[:limit]
+        selected = self._selected[field_name]
+        if selected is not None and all(code != selected for _count, code in items):
+            items.append((counts.get(selected, 0), selected))
+        return [(labels[code], code, count) for count, code in items]
+
+    def feature_ids(self):
+        """Ids of the features satisfying every facet."""
+        feature_ids = self.columns.feature_ids
+        return [feature_ids[row] for row, violations in enumerate(self._violations) if not violations]
+
+    def _flip(self, rows, field_name, delta):
+        """Add delta to the violation count of rows, whose status for field_name just flipped."""
+        others = [(self._counts[name], self.columns.codes(name), self._selected[name])
+                  for name in self._facets if name != field_name]
+        violations = self._violations
+        for row in rows:
+            before = violations[row]
+            after = before + delta
+            violations[row] = after
+            if not before:
+                self.matching_count -= 1
+            elif not after:
+                self.matching_count += 1
+            for counts, codes, selected in others:
+                code = codes[row]
+                # A row counts for a facet when it satisfies every other facet
+                own = 1 if selected is not None and code != selected else 0
+                if (before == own) != (after == own):
+                    counts[code] += 1 if after == own else -1
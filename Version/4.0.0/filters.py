@@ -0,0 +1,155 @@
+from collections import OrderedDict
+
+from qgis.core import (
+    QgsExpression, QgsExpressionContext, QgsExpressionContextUtils, QgsFeatureRequest, Qgis,
+)
+
+from .unique_values import NATIVE_DISTINCT_PROVIDERS, value_key
+
+
+class FilterBuilder:
+    """Type-correct filter expressions over the fields of one layer.
+
+    Listed values are converted to the field type, so numbers compare as
+    numbers and quoting is left to QgsExpression. Expressions are parsed and
+    prepared once, then kept per field, or per tuple of fields for
+    conjunctions, with a small LRU of values each; requests share them
+    instead of parsing filter strings again.
+    """
+
+    MAX_VALUES = 32  # Prepared expressions kept per field or tuple of fields
+
+    def __init__(self, layer):
+        self.layer = layer
+        self._expressions = {}  # Tuple of field names -> OrderedDict(tuple of values -> QgsExpression)
+        self._context = None
+
+    def typed_value(self, field_name, value):
+        """Convert a listed value to the type of its field; raise ValueError when it does not convert back to the same text."""
+        if value == "NULL":
+            return None  # Listed for NULL attributes
+        fields = self.layer.fields()
+        field_index = fields.indexOf(field_name)
+        if field_index < 0:
+            raise ValueError(f"{self.layer.name()} has no field {field_name}")
+        typed_value = fields.at(field_index).convertCompatible(value)
+        # The list shows str(value); a value that reads differently would match other features
+        if value_key(typed_value) != value:
+            raise ValueError(f"{value!r} is not a {fields.at(field_index).typeName()} value of {field_name}")
+        return typed_value
+
+    def can_compile(self, field_name):
+        """Whether the provider compiles filters on field_name into its own query."""
+        fields = self.layer.fields()
+        field_index = fields.indexOf(field_name)
+        provider = self.layer.dataProvider()
+        return (field_index >= 0 and provider is not None and provider.name() in NATIVE_DISTINCT_PROVIDERS
+                and fields.fieldOrigin(field_index) == Qgis.FieldOrigin.Provider)
+
+    def conjunction(self, conditions):
+        """Return the prepared expression matching every (field name, value) equality of conditions.
+
+        Raise ValueError when a value does not fit its field.
+        """
+        field_names = tuple(field_name for field_name, _value in conditions)
+        values = self._expressions.setdefault(field_names, OrderedDict())
+        key = tuple(value for _field_name, value in conditions)
+        expression = values.get(key)
+        if expression is not None:
+            values.move_to_end(key)
+            return expression
+        texts = [self._equality(field_name, value) for field_name, value in conditions]
+        expression = self._prepared(texts[0] if len(texts) == 1 else " AND ".join(f"({text})" for text in texts))
+        values[key] = expression
+        if len(values) > self.MAX_VALUES:
+            values.popitem(last=False)
+        return expression
+
+    def request(self, conditions, first_only=False):
+        """Return a request the provider compiles for conditions, or None when it cannot compile one of them."""
+        if not conditions or not all(self.can_compile(field_name) for field_name, _value in conditions):
+            return None
+        try:
+            expression = self.conjunction(conditions)
+        except ValueError:
+            return None
+        request = QgsFeatureRequest(expression)  # Shares the parsed expression
+        request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        request.setSubsetOfAttributes([field_name for field_name, _value in conditions], self.layer.fields())
+        if first_only:
+            request.setLimit(1)
+        return request
+
+    def clear(self):
+        """Forget the prepared expressions, e.g. after the fields of the layer changed."""
+        self._expressions.clear()
+        self._context = None
+
+    def _equality(self, field_name, value):
+        typed_value = self.typed_value(field_name, value)
+        # Also writes IS NULL for NULL values
+        return QgsExpression.createFieldEqualityExpression(
+            field_name, typed_value, self.layer.fields().field(field_name).type())
+
+    def _prepared(self, text):
+        expression = QgsExpression(text)
+        if self._context is None:
+            self._context = QgsExpressionContext(QgsExpressionContextUtils.globalProjectLayerScopes(self.layer))
+        expression.prepare(self._context)
+        return expression
+
+
+class ValueLookup:
+    """Find the features whose field values are listed as given strings.
+
+    The preferred path is a typed filter from FilterBuilder that SQL
+    providers compile into their WHERE clause, so their attribute indexes
+    answer it. Values that cannot be expressed that way are matched by a
+    NoGeometry scan that compares strings exactly like the Unique Values
+    list does.
+    """
+
+    EXPRESSION = "expression"
+    SCAN = "scan"
+
+    def __init__(self, layer, builder=None):
+        self.layer = layer
+        self.builder = builder if builder is not None else FilterBuilder(layer)
+
+    def equality_request(self, field_name, value, first_only=False):
+        """Return a compilable request for field = value, or None when the provider cannot compile it."""
+        return self.builder.request([(field_name, value)], first_only)
+
+    def feature_ids(self, field_name, value, first_only=False):
+        """Return (feature ids, path used)."""
+        return self.matching_feature_ids([(field_name, value)], first_only)
+
+    def matching_feature_ids(self, conditions, first_only=False):
+        """Return (ids of the features matching every (field name, value) of conditions, path used)."""
+        request = self.builder.request(conditions, first_only)
+        if request is not None:
+            return [feature.id() for feature in self.layer.getFeatures(request)], self.EXPRESSION
+        return self.scan_feature_ids(conditions, first_only), self.SCAN
+
+    def scan_feature_ids(self, conditions, first_only=False):
+        fields = self.layer.fields()
+        field_indexes = [fields.indexOf(field_name) for field_name, _value in conditions]
+        if not field_indexes or min(field_indexes) < 0:
+            return []
+        values = [value for _field_name, value in conditions]
+        request = QgsFeatureRequest()
+        request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        request.setSubsetOfAttributes(field_indexes)
+        feature_ids = []
+        for feature in self.layer.getFeatures(request):
+            if all(self._listed_as(feature[field_index], value) for field_index, value in zip(field_indexes, values)):
+                feature_ids.append(feature.id())
+                if first_only:
+                    break
+        return feature_ids
+
+    @staticmethod
+    def _listed_as(field_value, value):
+        if value == "NULL":
+            return field_value is None
+        return value_key(field_value) == value
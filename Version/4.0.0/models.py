@@ -0,0 +1,410 @@
+from array import array
+from bisect import bisect_left
+
+from qgis.PyQt.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex, pyqtSignal
+from qgis.PyQt.QtGui import QColor, QFont
+
+
+class UniqueValuesModel(QAbstractListModel):
+    """Read-only list model serving unique values from one sorted sequence.
+
+    Rows are produced on demand by data(), so the view never allocates an
+    item per value. Values streamed in by a background scan are appended
+    unsorted and sorted once by sort() when the scan ends. A search result
+    is applied with set_filter(), which maps view rows to value positions.
+    With a page size, unfiltered values are shown one page at a time as the
+    view fetches more.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._values = ()
+        self._sorted = True
+        self._rows = None  # Positions in _values shown by the view, None shows every value
+        self._rows_sorted = True
+        self._page_size = None  # None shows every value at once
+        self._loaded = 0  # Values shown while paging
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return self._shown()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self._rows is None and self._page_size is not None
+                and self._loaded < len(self._values))
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._load_through(self._loaded)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        return self.value(index.row())
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemNeverHasChildren
+
+    def value(self, row):
+        """Return the value shown on a row, or None when the row does not exist."""
+        if self._rows is not None:
+            if not 0 <= row < len(self._rows):
+                return None
+            row = self._rows[row]
+        elif row >= self._shown():
+            return None
+        if 0 <= row < len(self._values):
+            return self._values[row]
+        return None
+
+    def values(self):
+        """All values, including those hidden by the filter."""
+        return self._values
+
+    def is_filtered(self):
+        return self._rows is not None
+
+    def set_filter(self, rows, ordered=True):
+        """Show only the values at the given positions, in that order; None shows every value.
+
+        ordered tells find() that rows are ascending and can be bisected.
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self._rows_sorted = ordered
+        self.endResetModel()
+
+    def set_page_size(self, page_size):
+        """Show unfiltered values page_size at a time, None shows them all."""
+        self.beginResetModel()
+        self._page_size = page_size
+        self._loaded = page_size or 0
+        self.endResetModel()
+
+    def set_values(self, values):
+        """Replace the values; a tuple that is already sorted is shared, not copied."""
+        self.beginResetModel()
+        self._loaded = self._page_size or 0
+        if isinstance(values, tuple):
+            self._values = values
+        else:
+            self._values = tuple(sorted(values))
+        self._sorted = True
+        self._rows = None
+        self.endResetModel()
+
+    def append_values(self, values):
+        """Append streamed values at the end; call sort() once streaming ends."""
+        if not values:
+            return
+        if not isinstance(self._values, list):
+            self._values = list(self._values)
+        self._sorted = False
+        if self._rows is not None:
+            # Hidden until the owner refreshes the filter
+            self._values.extend(values)
+            return
+        first = self._shown()
+        last = len(self._values) + len(values)
+        if self._page_size is not None:
+            last = min(last, self._loaded)
+        if last <= first:
+            self._values.extend(values)  # Beyond the loaded pages
+            return
+        self.beginInsertRows(QModelIndex(), first, last - 1)
+        self._values.extend(values)
+        self.endInsertRows()
+
+    def sort(self, column=0, order=Qt.SortOrder.AscendingOrder):
+        self.sort_values()
+
+    def sort_values(self):
+        """Sort streamed values into the compact tuple used at rest; return False when they already were."""
+        if self._sorted and isinstance(self._values, tuple):
+            return False
+        self.set_values(self._values)
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        self._values = ()
+        self._sorted = True
+        self._rows = None
+        self._loaded = self._page_size or 0
+        self.endResetModel()
+
+    def insert_value(self, value):
+        """Insert one value at its sorted position and return the position, -1 when it was listed already.
+
+        Under a filter the value stays hidden until the filter is refreshed.
+        """
+        if not self._sorted or self._position(value) >= 0:
+            return -1
+        if not isinstance(self._values, list):
+            self._values = list(self._values)
+        position = bisect_left(self._values, value)
+        if self._rows is not None:
+            self._values.insert(position, value)
+            self._rows = array('l', (row + 1 if row >= position else row for row in self._rows))
+            return position
+        if self._page_size is not None:
+            if position >= self._loaded:
+                self._values.insert(position, value)  # Beyond the loaded pages
+                return position
+            self._loaded += 1
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._values.insert(position, value)
+        self.endInsertRows()
+        return position
+
+    def remove_value(self, value):
+        """Remove one value, and its row when the filter shows it; return its former position or -1."""
+        position = self._position(value)
+        if position < 0:
+            return -1
+        if not isinstance(self._values, list):
+            self._values = list(self._values)
+        if self._rows is None:
+            if self._page_size is not None:
+                if position >= self._loaded:
+                    del self._values[position]
+                    return position
+                self._loaded -= 1
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self._values[position]
+            self.endRemoveRows()
+            return position
+        row = self.find(value)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self._values[position]
+        self._rows = array('l', (shown - 1 if shown > position else shown
+                                 for shown in self._rows if shown != position))
+        if row >= 0:
+            self.endRemoveRows()
+        return position
+
+    def find(self, value):
+        """Return the row showing value, or -1 when it is not listed or filtered out."""
+        position = self._position(value)
+        if position < 0:
+            return position
+        if self._rows is None:
+            if position >= self._shown():
+                self._load_through(position)
+            return position
+        if self._rows_sorted:
+            row = bisect_left(self._rows, position)
+            return row if row < len(self._rows) and self._rows[row] == position else -1
+        try:
+            return list(self._rows).index(position)
+        except ValueError:
+            return -1
+
+    def _shown(self):
+        if self._page_size is None:
+            return len(self._values)
+        return min(len(self._values), self._loaded)
+
+    def _load_through(self, position):
+        """Show the pages up to and including position."""
+        first = self._shown()
+        loaded = (position // self._page_size + 1) * self._page_size
+        last = min(len(self._values), loaded)
+        if last <= first:
+            return
+        self.beginInsertRows(QModelIndex(), first, last - 1)
+        self._loaded = loaded
+        self.endInsertRows()
+
+    def _position(self, value):
+        if self._sorted:
+            position = bisect_left(self._values, value)
+            if position < len(self._values) and self._values[position] == value:
+                return position
+            return -1
+        try:
+            return self._values.index(value)
+        except ValueError:
+            return -1
+
+
+class FeatureAttributesModel(QAbstractTableModel):
+    """Table model listing the attributes of one feature, one field per row.
+
+    The first row reports whether the feature has a geometry. Only the
+    attribute vector is stored; names and display text are produced by
+    data() for the rows the view paints, so repopulating costs the same
+    whatever the field count. The optional selection column holds one
+    checked row, painted as a radio button by RadioButtonDelegate.
+    """
+
+    selectionRowChanged = pyqtSignal(int, int)  # Checked row and previous one, -1 for none
+
+    GEOMETRY_ROW = 0
+    NAME_COLUMN = 0
+    VALUE_COLUMN = 1
+    SELECTION_COLUMN = 2
+    PLACEHOLDER = "--"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fields = None
+        self._attributes = None  # None shows the placeholder for every value
+        self._has_geometry = False
+        self._overrides = {}  # Row to text shown instead of the attribute
+        self._selection_column = False
+        self._selection_row = -1
+        self._excluded_row = self.GEOMETRY_ROW  # Field row that cannot be checked
+        self._header_font = QFont()
+        self._header_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._fields is None:
+            return 0
+        return self._fields.count() + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 3 if self._selection_column else 2
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return ("Field Name", "Value", "Additional Selection")[section]
+        if role == Qt.ItemDataRole.FontRole:
+            return self._header_font
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.NAME_COLUMN:
+                return self.field_name(row)
+            if column == self.VALUE_COLUMN:
+                return self.value_text(row)
+            return None
+        if (role == Qt.ItemDataRole.BackgroundRole and row == self.GEOMETRY_ROW
+                and column == self.VALUE_COLUMN and self._attributes is not None and not self._has_geometry):
+            return QColor("yellow")
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if (role != Qt.ItemDataRole.CheckStateRole or index.column() != self.SELECTION_COLUMN
+                or not self.is_selectable(index.row())):
+            return False
+        if value == Qt.CheckState.Checked:
+            self.set_selection_row(index.row())
+        elif index.row() == self._selection_row:
+            self.set_selection_row(-1)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemNeverHasChildren
+        if index.column() == self.SELECTION_COLUMN and self.is_selectable(index.row()):
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def is_selectable(self, row):
+        """Whether row shows a radio button in the selection column."""
+        return (self._selection_column and row != self.GEOMETRY_ROW and row != self._excluded_row
+                and 0 <= row < self.rowCount())
+
+    def selection_row(self):
+        return self._selection_row
+
+    def set_selection_row(self, row):
+        """Check row in the selection column, -1 unchecks every row."""
+        previous = self._selection_row
+        if row == previous:
+            return
+        self._selection_row = row
+        for changed in (previous, row):
+            if changed >= 0 and self._selection_column:
+                index = self.index(changed, self.SELECTION_COLUMN)
+                self.dataChanged.emit(index, index)
+        self.selectionRowChanged.emit(row, previous)
+
+    def field_name(self, row):
+        """Name shown on a row; the geometry row is listed as Geometry_Type."""
+        if row == self.GEOMETRY_ROW:
+            return "Geometry_Type"
+        return self._fields.at(row - 1).name()
+
+    def value_text(self, row):
+        text = self._overrides.get(row)
+        if text is not None:
+            return text
+        if self._attributes is None:
+            return self.PLACEHOLDER
+        if row == self.GEOMETRY_ROW:
+            return "Has a Geometry" if self._has_geometry else "Has No Geometry"
+        return str(self._attributes[row - 1])
+
+    def set_feature(self, fields, feature, excluded_field=None):
+        """Show the attributes of feature, or placeholders for every field when feature is None.
+
+        The row of excluded_field gets no radio button. The checked row is
+        cleared without emitting selectionRowChanged.
+        """
+        self.beginResetModel()
+        self._fields = fields
+        self._overrides = {}
+        self._selection_row = -1
+        self._excluded_row = fields.indexOf(excluded_field) + 1 if excluded_field else self.GEOMETRY_ROW
+        if feature is None:
+            self._attributes = None
+            self._has_geometry = False
+        else:
+            self._attributes = feature.attributes()
+            geometry = feature.geometry()
+            self._has_geometry = bool(geometry) and not geometry.isEmpty()
+        self.endResetModel()
+
+    def update_attributes(self, feature):
+        """Show the attributes of another feature of the same layer, keeping the rows."""
+        if self._fields is None:
+            return
+        self._attributes = feature.attributes()
+        geometry = feature.geometry()
+        self._has_geometry = bool(geometry) and not geometry.isEmpty()
+        self._overrides = {}
+        self.dataChanged.emit(self.index(0, self.VALUE_COLUMN),
+                              self.index(self.rowCount() - 1, self.VALUE_COLUMN))
+
+    def set_value_text(self, row, text):
+        """Show text instead of the attribute on a row until the next feature is set."""
+        self._overrides[row] = text
+        index = self.index(row, self.VALUE_COLUMN)
+        self.dataChanged.emit(index, index)
+
+    def set_selection_column(self, visible):
+        if visible == self._selection_column:
+            return
+        if visible:
+            self.beginInsertColumns(QModelIndex(), self.SELECTION_COLUMN, self.SELECTION_COLUMN)
+            self._selection_column = True
+            self.endInsertColumns()
+        else:
+            self.beginRemoveColumns(QModelIndex(), self.SELECTION_COLUMN, self.SELECTION_COLUMN)
+            self._selection_column = False
+            self.endRemoveColumns()
+
+    def clear(self):
+        self.beginResetModel()
+        self._fields = None
+        self._attributes = None
+        self._overrides = {}
+        self._selection_row = -1
+        self.endResetModel()
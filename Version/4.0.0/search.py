@@ -0,0 +1,300 @@
+import heapq
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+from qgis.core import QgsTask
+
+
+def normalize(text):
+    """Key used for case-insensitive matching."""
+    return text.lower()
+
+
+def grams(key, size=3):
+    return {key[i:i + size] for i in range(len(key) - size + 1)}
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """Edit distance between a and b, or None as soon as it must exceed max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        row_minimum = i
+        for j, char_b in enumerate(b, start=1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            current.append(cost)
+            if cost < row_minimum:
+                row_minimum = cost
+        if row_minimum > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def similarity(a, b):
+    """1.0 for equal strings, decreasing with the edit distance, 0.0 past a third of the length."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    distance = bounded_levenshtein(a, b, max(1, longest // 3))
+    return 0.0 if distance is None else 1.0 - distance / longest
+
+
+def _contains(positions, position):
+    """Membership test in an ascending array('l')."""
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
+
+
+class TrigramIndex:
+    """Inverted index from every 3-character substring of the keys to the key positions.
+
+    Posting lists are ascending array('l'), so they can be intersected by
+    bisection starting from the shortest one.
+    """
+
+    SIZE = 3
+
+    def __init__(self, keys, is_canceled=None):
+        postings = {}
+        for position, key in enumerate(keys):
+            for gram in grams(key, self.SIZE):
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = array('l', (position,))
+                else:
+                    posting.append(position)
+            if is_canceled is not None and position % 10000 == 0 and is_canceled():
+                break
+        self._postings = postings
+        self.key_count = len(keys)
+        self.memory_bytes = sys.getsizeof(postings) + sum(
+            sys.getsizeof(gram) + sys.getsizeof(posting) for gram, posting in postings.items())
+
+    def overlap_counts(self, query, budget):
+        """Count the query trigrams each key shares, reading the rarest posting lists first.
+
+        Reading stops once budget posting entries were counted, so very
+        common trigrams cannot make a query slow. Returns None when even the
+        rarest trigram of the query is too common to fit in the budget.
+        """
+        counts = Counter()
+        postings = sorted(
+            (posting for posting in map(self._postings.get, grams(query, self.SIZE)) if posting is not None),
+            key=len)
+        if postings and len(postings[0]) > budget:
+            return None
+        read = 0
+        for posting in postings:
+            if read + len(posting) > budget:
+                break
+            counts.update(posting)
+            read += len(posting)
+        return counts
+
+    def candidates(self, query):
+        """Ascending positions of keys holding every trigram of query; they still need a substring check.
+
+        Returns None when every trigram is so common that a linear scan is cheaper.
+        """
+        postings = [self._postings.get(gram) for gram in grams(query, self.SIZE)]
+        if not postings or any(posting is None for posting in postings):
+            return array('l')
+        postings.sort(key=len)
+        if len(postings[0]) > self.key_count // 8:
+            return None
+        shortest, others = postings[0], postings[1:]
+        return array('l', (position for position in shortest
+                           if all(_contains(posting, position) for posting in others)))
+
+
+class TrigramIndexTask(QgsTask):
+    """Normalize the values and build their TrigramIndex in the background."""
+
+    def __init__(self, values):
+        super().__init__("Indexing unique values for search", QgsTask.Flag.CanCancel)
+        self.values = values
+        self.keys = None
+        self.index = None
+
+    def run(self):
+        self.keys = [normalize(value) for value in self.values]
+        if self.isCanceled():
+            return False
+        self.index = TrigramIndex(self.keys, self.isCanceled)
+        return not self.isCanceled()
+
+
+class ValueSearchEngine:
+    """Case-insensitive substring search over the listed unique values.
+
+    Lowercase keys are computed once per value list. Queries of three or
+    more characters are answered from a TrigramIndex when one was attached
+    with set_index(); otherwise, when a query contains the previous query,
+    only the previous matches are searched again. Every change of the
+    values bumps generation(), which tells whether an index built in the
+    background still matches them.
+    """
+
+    FUZZY_POSTING_BUDGET = 150000  # Posting entries read per fuzzy query
+    FUZZY_CANDIDATES = 300  # Keys sharing the most trigrams that get an edit distance
+    FUZZY_MIN_SCORE = 0.6
+    FUZZY_LIMIT = 200
+
+    def __init__(self):
+        self._values = ()
+        self._generation = 0
+        self._keys = None  # Built on the first search after set_values()
+        self._index = None
+        self._last_query = ""
+        self._last_matches = None
+
+    def set_values(self, values):
+        """Use a new value sequence; positions returned by search() index into it."""
+        self._values = values
+        self._generation += 1
+        self._keys = None
+        self._index = None
+        self.reset()
+
+    def values(self):
+        return self._values
+
+    def generation(self):
+        """Change counter of the values, pass it back to set_index()."""
+        return self._generation
+
+    def set_index(self, generation, keys, index):
+        """Attach a TrigramIndex built for the values of generation; ignored when they changed since."""
+        if generation != self._generation:
+            return False
+        self._keys = keys
+        self._index = index
+        return True
+
+    def index_memory_bytes(self):
+        return self._index.memory_bytes if self._index is not None else 0
+
+    def has_index(self):
+        return self._index is not None
+
+    def append_values(self, all_values, values):
+        """Extend the keys with streamed values, keeping the last match set consistent.
+
+        all_values is the value sequence after values were appended to it.
+        """
+        self._values = all_values
+        self._generation += 1
+        self._index = None  # Streamed values are not indexed
+        if self._keys is None:
+            return
+        first = len(self._keys)
+        new_keys = [normalize(value) for value in values]
+        self._keys.extend(new_keys)
+        if self._last_matches is not None:
+            query = self._last_query
+            # A new array: the previous one may be shown by a model
+            self._last_matches = self._last_matches + array(
+                'l', (first + offset for offset, key in enumerate(new_keys) if query in key))
+
+    def value_inserted(self, all_values, position):
+        """Follow a value inserted at position of all_values, the list after the insertion."""
+        self._values = all_values
+        self._generation += 1
+        self._index = None  # Positions after the insertion moved
+        if self._keys is not None:
+            self._keys.insert(position, normalize(all_values[position]))
+        self.reset()
+
+    def value_removed(self, all_values, position):
+        """Follow the removal of the value at position, all_values is the list after the removal."""
+        self._values = all_values
+        self._generation += 1
+        self._index = None
+        if self._keys is not None:
+            del self._keys[position]
+        self.reset()
+
+    def reset(self):
+        """Forget the previous query so the next search scans every key."""
+        self._last_query = ""
+        self._last_matches = None
+
+    def keys(self):
+        if self._keys is None:
+            self._keys = [normalize(value) for value in self._values]
+        return self._keys
+
+    def fuzzy_search(self, text):
+        """Return value positions ranked by similarity to text, best first, or None for an empty query.
+
+        Falls back to search() for queries shorter than a trigram or while no
+        TrigramIndex is attached.
+        """
+        query = normalize(text).strip()
+        if len(query) < TrigramIndex.SIZE or self._index is None:
+            return self.search(text)
+        keys = self.keys()
+        counts = self._index.overlap_counts(query, self.FUZZY_POSTING_BUDGET)
+        if counts is None:
+            # Only very common trigrams: plenty of values contain the query as typed
+            return array('l', islice((row for row, key in enumerate(keys) if query in key), self.FUZZY_LIMIT))
+        candidates = heapq.nlargest(self.FUZZY_CANDIDATES, counts.items(), key=itemgetter(1))
+        query_tokens = query.split()
+        token_scores = {}  # Values share many words, score each word once per query
+        scored = []
+        for position, _shared in candidates:
+            score = self._fuzzy_score(query, query_tokens, keys[position], token_scores)
+            if score >= self.FUZZY_MIN_SCORE:
+                scored.append((score, -position))
+        ranked = heapq.nlargest(self.FUZZY_LIMIT, scored)
+        return array('l', (-negative_position for _score, negative_position in ranked))
+
+    @staticmethod
+    def _fuzzy_score(query, query_tokens, key, token_scores):
+        if query in key:
+            return 2.0 if key.startswith(query) else 1.5
+        whole = similarity(query, key)
+        key_tokens = key.split()
+        if not key_tokens:
+            return whole
+        # Each query word against its best matching word of the value
+        total = 0.0
+        for query_token in query_tokens:
+            best = 0.0
+            for key_token in key_tokens:
+                pair = (query_token, key_token)
+                score = token_scores.get(pair)
+                if score is None:
+                    score = token_scores[pair] = similarity(query_token, key_token)
+                if score > best:
+                    best = score
+            total += best
+        return max(whole, total / len(query_tokens))
+
+    def search(self, text):
+        """Return the ascending positions of values containing text, or None for an empty query."""
+        query = normalize(text)
+        if not query:
+            self.reset()
+            return None
+        keys = self.keys()
+        candidates = None
+        if self._index is not None and len(query) >= TrigramIndex.SIZE:
+            candidates = self._index.candidates(query)
+        if candidates is not None:
+            matches = array('l', (row for row in candidates if query in keys[row]))
+        elif self._last_matches is not None and self._last_query in query:
+            # Every match of the longer query also matched the previous one
+            matches = array('l', (row for row in self._last_matches if query in keys[row]))
+        else:
+            matches = array('l', (row for row, key in enumerate(keys) if query in key))
+        self._last_query = query
+        self._last_matches = matches
+        return matches
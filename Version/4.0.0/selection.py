@@ -0,0 +1,52 @@
+from qgis.core import QgsFeatureRequest, QgsRectangle
+
+
+class SelectionSnapshot:
+    """The selected features of a layer, fetched once and shared by every consumer.
+
+    A snapshot lives for one selection-change cycle: the dialog drops it
+    whenever the selection changes, and the next consumer takes a new one.
+    Features are only fetched when a consumer needs more than the count.
+    """
+
+    fetch_count = 0  # Provider fetches made by all snapshots, read by the benchmarks
+
+    def __init__(self, layer, bbox_cache=None):
+        self.layer = layer
+        self.bbox_cache = bbox_cache
+        self.feature_ids = layer.selectedFeatureIds()
+        self._first = None
+        self._extent = None
+
+    def count(self):
+        return len(self.feature_ids)
+
+    def first(self):
+        """The selected feature with the lowest id; only that feature is fetched."""
+        if self._first is None and self.feature_ids:
+            SelectionSnapshot.fetch_count += 1
+            request = QgsFeatureRequest().setFilterFid(min(self.feature_ids))
+            self._first = next(self.layer.getFeatures(request), None)
+        return self._first
+
+    def extent(self):
+        """Union of the bounding boxes of the selected features in layer CRS, without their attributes.
+
+        Answered from the BBoxCache when one is given and current, otherwise
+        from the single feature already fetched, otherwise by one
+        geometry-only request.
+        """
+        if self._extent is None:
+            extent = self.bbox_cache.extent(self.feature_ids) if self.bbox_cache is not None else None
+            self._extent = extent if extent is not None else self._features_extent()
+        return self._extent
+
+    def _features_extent(self):
+        if self._first is None or len(self.feature_ids) != 1:
+            SelectionSnapshot.fetch_count += 1
+            return self.layer.boundingBoxOfSelected()
+        extent = QgsRectangle()
+        extent.setNull()
+        if self._first.hasGeometry():
+            extent.combineExtentWith(self._first.geometry().boundingBox())
+        return extent
@@ -0,0 +1,101 @@
+# coding=utf-8
+"""Selection benchmark.
+
+Clicks through the Unique Values list of a memory layer and counts how
+many times the selected features are fetched per click. Run it from a
+QGIS Python environment::
+
+    python3 test/benchmark_selection.py --features 100000 --clicks 200
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'mygis@gis.my'
+__date__ = '2026-10-18'
+__copyright__ = 'Copyright 2026, GIS Innovation Sdn. Bhd.'
+
+import argparse
+import time
+
+from utilities import get_qgis_app, load_plugin_module
+
+QGIS_APP, CANVAS, IFACE, PARENT = get_qgis_app()
+
+from qgis.core import QgsApplication, QgsFeature, QgsGeometry, QgsPointXY, QgsProject, QgsVectorLayer  # noqa: E402
+
+
+def create_points_layer(count):
+    layer = QgsVectorLayer("Point?crs=EPSG:4326&field=id:integer&field=name:string", "points", "memory")
+    features = []
+    for fid in range(count):
+        feature = QgsFeature(layer.fields())
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(fid % 360 - 180.0, (fid // 360) % 180 - 90.0)))
+        feature.setAttributes([fid, f"Name {fid}"])
+        features.append(feature)
+    layer.dataProvider().addFeatures(features)
+    QgsProject.instance().addMapLayer(layer)
+    return layer
+
+
+def wait_for_listing(dialog):
+    """Process events until the background tasks listing the values of large layers are done."""
+    while dialog.listing_in_progress() or QgsApplication.taskManager().countActiveTasks():
+        QGIS_APP.processEvents()
+        time.sleep(0.001)
+
+
+class FetchCounter:
+    """Count calls of the legacy QgsVectorLayer.selectedFeatures() path."""
+
+    def __init__(self, layer):
+        self.calls = 0
+        self._selected_features = layer.selectedFeatures
+        layer.selectedFeatures = self
+
+    def __call__(self):
+        self.calls += 1
+        return self._selected_features()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=100000)
+    parser.add_argument("--clicks", type=int, default=200)
+    args = parser.parse_args()
+
+    dialog_module = load_plugin_module("easyfeatureselection_dialog")
+    selection_module = load_plugin_module("selection")
+
+    layer = create_points_layer(args.features)
+    IFACE.setActiveLayer(layer)
+    dialog = dialog_module.EasyFeatureSelectionDialog()
+    dialog.interact_checkbox.setChecked(True)
+    dialog.field_combo_box.setCurrentIndex(layer.fields().indexOf("name"))
+    QGIS_APP.processEvents()
+    wait_for_listing(dialog)
+
+    legacy = FetchCounter(layer)
+    snapshot_fetches = selection_module.SelectionSnapshot.fetch_count
+    clicks = min(args.clicks, dialog.unique_values_model.rowCount())
+    if not clicks:
+        print("No values listed, nothing to click")
+        return
+    start = time.perf_counter()
+    for row in range(clicks):
+        dialog.unique_values_list.setCurrentIndex(dialog.unique_values_model.index(row))
+        # Every click is measured as a first move, not coalesced with the next one
+        dialog._cancel_pending_highlight()
+    elapsed = time.perf_counter() - start
+    snapshot_fetches = selection_module.SelectionSnapshot.fetch_count - snapshot_fetches
+
+    print(f"{clicks} clicks on {layer.featureCount()} features in {elapsed:.3f} s")
+    print(f"  selectedFeatures() calls per click: {legacy.calls / clicks:.2f}")
+    print(f"  snapshot fetches per click:         {snapshot_fetches / clicks:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# coding=utf-8
+"""Dialog hot path benchmark suite.
+
+Generates point layers in memory, GeoPackage and shapefile form, each
+with a low and a high cardinality field, and times the dialog methods
+that run on every user action. Results are written to JSON and compared
+against regression thresholds; the exit status is 1 when one is
+exceeded. Run it from a QGIS Python environment::
+
+    python3 test/benchmark_suite.py --sizes 10000,100000 --output results.json
+
+The full run covers 10k, 100k, 1M and 5M features; at 5M the high
+cardinality field is only searched, not listed. Generated files are
+kept in --data-dir and reused by later runs.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'mygis@gis.my'
+__date__ = '2026-10-18'
+__copyright__ = 'Copyright 2026, GIS Innovation Sdn. Bhd.'
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from utilities import get_qgis_app, load_plugin_module
+
+QGIS_APP, CANVAS, IFACE, PARENT = get_qgis_app()
+
+from qgis.PyQt.QtCore import QMetaType  # noqa: E402
+from qgis.core import (  # noqa: E402
+    Qgis, QgsApplication, QgsCoordinateReferenceSystem, QgsCoordinateTransformContext,
+    QgsFeature, QgsField, QgsFields, QgsGeometry, QgsPointXY, QgsProject, QgsVectorFileWriter,
+    QgsVectorLayer,
+)
+
+unique_values = load_plugin_module("unique_values")
+
+DEFAULT_SIZES = "10000,100000,1000000,5000000"
+DEFAULT_PROVIDERS = "memory,gpkg,shp"
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_thresholds.json")
+BATCH_SIZE = 50000
+CATEGORY_COUNT = 50  # Values of the low cardinality field
+FIELDS = (("category", "low"), ("code", "high"))
+TASK_TIMEOUT = 3600.0
+
+
+def create_fields():
+    fields = QgsFields()
+    fields.append(QgsField("id", QMetaType.Type.Int))
+    fields.append(QgsField("category", QMetaType.Type.QString))
+    fields.append(QgsField("code", QMetaType.Type.QString))
+    return fields
+
+
+def create_features(fields, count):
+    """Yield batches of points; code repeats every second feature, category every CATEGORY_COUNT."""
+    batch = []
+    for fid in range(count):
+        feature = QgsFeature(fields)
+        feature.setGeometry(QgsGeometry.fromPointXY(
+            QgsPointXY((fid % 3600) / 10.0 - 180.0, (fid // 3600) % 1800 / 10.0 - 90.0)))
+        feature.setAttributes([fid, f"Category {fid % CATEGORY_COUNT}", f"C{fid // 2:08d}"])
+        batch.append(feature)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def create_memory_layer(count):
+    layer = QgsVectorLayer("Point?crs=EPSG:4326&field=id:integer&field=category:string&field=code:string",
+                           f"memory_{count}", "memory")
+    for batch in create_features(layer.fields(), count):
+        layer.dataProvider().addFeatures(batch)
+    return layer
+
+
+def create_file_layer(data_dir, provider, count):
+    """Write the points to a GeoPackage or shapefile in data_dir, unless an earlier run left one."""
+    name = f"points_{count}"
+    if provider == "gpkg":
+        path = os.path.join(data_dir, f"{name}.gpkg")
+        uri = f"{path}|layername={name}"
+    else:
+        path = os.path.join(data_dir, f"{name}.shp")
+        uri = path
+    if not os.path.exists(path):
+        fields = create_fields()
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = "GPKG" if provider == "gpkg" else "ESRI Shapefile"
+        options.layerName = name
+        writer = QgsVectorFileWriter.create(
+            path, fields, Qgis.WkbType.Point, QgsCoordinateReferenceSystem("EPSG:4326"),
+            QgsCoordinateTransformContext(), options)
+        for batch in create_features(fields, count):
+            writer.addFeatures(batch)
+        del writer
+    return QgsVectorLayer(uri, f"{provider}_{count}", "ogr")
+
+
+def create_layer(data_dir, provider, count):
+    if provider == "memory":
+        layer = create_memory_layer(count)
+    else:
+        layer = create_file_layer(data_dir, provider, count)
+    if not layer.isValid():
+        raise RuntimeError(f"Could not create the {provider} layer of {count} features")
+    QgsProject.instance().addMapLayer(layer)
+    return layer
+
+
+def wait_until(predicate, timeout=TASK_TIMEOUT):
+    """Process events until predicate() holds, e.g. until a background task of the dialog finished."""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Background task did not finish")
+        QGIS_APP.processEvents()
+        time.sleep(0.001)
+
+
+def wait_for_tasks(dialog):
+    wait_until(lambda: not dialog.listing_in_progress() and dialog._value_search_task is None
+               and dialog._trigram_task is None and dialog._bbox_task is None and QgsApplication.taskManager().countActiveTasks() == 0)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def summary(operation, timings, **labels):
+    result = dict(labels)
+    result.update(
+        operation=operation,
+        calls=len(timings),
+        min_s=min(timings),
+        median_s=statistics.median(timings),
+        max_s=max(timings),
+    )
+    return result
+
+
+def sample_rows(row_count, count):
+    if row_count <= 0:
+        return []
+    step = max(1, row_count // count)
+    return list(range(0, row_count, step))[:count]
+
+
+def search_text(field_name):
+    """A substring matching about one value in ten of the field."""
+    return "Category 1" if field_name == "category" else "5"
+
+
+def benchmark_field(dialog, field_name, repeat, clicks):
+    """Time each hot path of the dialog on one field of the current layer.
+
+    Fields with too many values for a list are only searched: the search
+    and the clicks on its results are timed instead of filtering and
+    browsing the list.
+    """
+    timings = {}
+
+    def cold_unique_values():
+        dialog.unique_value_cache.clear()
+        dialog.disk_cache.clear()
+        dialog.update_unique_values()
+        wait_for_tasks(dialog)
+
+    dialog.field_combo_box.setCurrentIndex(dialog.layer.fields().indexOf(field_name))
+    wait_for_tasks(dialog)
+    timings["update_unique_values"] = [timed(cold_unique_values) for _ in range(repeat)]
+    search_only = dialog._listing == unique_values.UniqueValueEngine.SEARCH_ONLY
+    if not search_only:  # Search results are not cached
+        timings["update_unique_values_cached"] = [timed(dialog.update_unique_values) for _ in range(repeat)]
+    wait_for_tasks(dialog)
+
+    def filter_values():
+        dialog.filter_values()
+        wait_until(lambda: dialog._value_search_task is None)  # Searched by a task in search-only mode
+
+    highlight = "highlight_search_result" if search_only else "highlight_features"
+    dialog.search_box.blockSignals(True)
+    try:
+        filter_timings = []
+        for _ in range(repeat):
+            dialog.search_box.setText(search_text(field_name))
+            filter_timings.append(timed(filter_values))
+            if not search_only:  # Search-only mode keeps the results to click
+                dialog.search_box.setText("")
+                filter_values()
+        timings["search_values" if search_only else "filter_values"] = filter_timings
+
+        rows = sample_rows(dialog.unique_values_model.rowCount(), clicks)
+        for name in (highlight, "populate_table_with_selected_feature", "zoom_to_selected_feature"):
+            timings[name] = []
+        for row in rows:
+            # Every call is timed as a first move, not coalesced with the previous one
+            dialog._cancel_pending_highlight()
+            timings[highlight].append(timed(dialog.highlight_features, row))
+            dialog._invalidate_selection_snapshot()
+            timings["populate_table_with_selected_feature"].append(timed(dialog.populate_table_with_selected_feature))
+            timings["zoom_to_selected_feature"].append(timed(dialog.zoom_to_selected_feature))
+            QGIS_APP.processEvents()
+        dialog._cancel_pending_highlight()
+        if search_only:
+            dialog.search_box.setText("")
+            filter_values()
+    finally:
+        dialog.search_box.blockSignals(False)
+    return {operation: values for operation, values in timings.items() if values}
+
+
+def check_thresholds(results, thresholds, baseline, tolerance):
+    """Return the results whose median exceeds its threshold, or the baseline median times tolerance."""
+    baseline_medians = {}
+    for result in baseline.get("results", []) if baseline else []:
+        baseline_medians[result_key(result)] = result["median_s"]
+    regressions = []
+    for result in results:
+        limit = thresholds.get(result["operation"], {}).get(str(result["features"]))
+        if limit is not None and result["median_s"] > limit:
+            regressions.append(dict(result, limit_s=limit, reason="threshold"))
+            continue
+        previous = baseline_medians.get(result_key(result))
+        if previous is not None and result["median_s"] > previous * tolerance:
+            regressions.append(dict(result, limit_s=previous * tolerance, reason="baseline"))
+    return regressions
+
+
+def result_key(result):
+    return (result["provider"], result["features"], result["field"], result["operation"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma separated feature counts")
+    parser.add_argument("--providers", default=DEFAULT_PROVIDERS, help="Comma separated: memory, gpkg, shp")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of update_unique_values and filter_values")
+    parser.add_argument("--clicks", type=int, default=50, help="Values browsed per field")
+    parser.add_argument("--data-dir", help="Keep generated GeoPackages and shapefiles here")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH, help="JSON of operation -> feature count -> seconds")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown against --baseline")
+    args = parser.parse_args()
+
+    dialog_module = load_plugin_module("easyfeatureselection_dialog")
+    disk_cache_module = load_plugin_module("disk_cache")
+    data_dir = args.data_dir or tempfile.mkdtemp()
+    os.makedirs(data_dir, exist_ok=True)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    providers = args.providers.split(",")
+
+    dialog = dialog_module.EasyFeatureSelectionDialog()
+    # Never read or fill the disk cache of the QGIS profile
+    dialog.disk_cache.close()
+    dialog.disk_cache = disk_cache_module.DiskValueCache(
+        os.path.join(tempfile.mkdtemp(), "unique_values_cache.sqlite"), dialog.disk_cache.max_bytes)
+    results = []
+    for count in sizes:
+        for provider in providers:
+            start = time.perf_counter()
+            layer = create_layer(data_dir, provider, count)
+            print(f"{provider} layer of {layer.featureCount():,} features ready in {time.perf_counter() - start:.1f} s")
+            dialog.on_layer_changed(layer)
+            dialog._current_bbox_cache()  # Built on the first zoom otherwise, while the clicks are timed
+            wait_for_tasks(dialog)
+            for field_name, cardinality in FIELDS:
+                timings = benchmark_field(dialog, field_name, args.repeat, args.clicks)
+                for operation, values in timings.items():
+                    result = summary(operation, values, provider=provider, features=count,
+                                     field=field_name, cardinality=cardinality)
+                    results.append(result)
+                    print(f"  {field_name:<9}{operation:<40}median {result['median_s'] * 1000:10.2f} ms")
+            dialog.on_layer_changed(None)
+            QgsProject.instance().removeMapLayer(layer.id())
+            QGIS_APP.processEvents()
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = check_thresholds(results, thresholds, baseline, args.tolerance)
+
+    report = {
+        "qgis_version": Qgis.version(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+        "regressions": regressions,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    for regression in regressions:
+        print(f"REGRESSION {regression['operation']} on {regression['provider']} {regression['features']:,} "
+              f"{regression['field']}: median {regression['median_s']:.4f} s > {regression['limit_s']:.4f} s "
+              f"({regression['reason']})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
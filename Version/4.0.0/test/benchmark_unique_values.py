@@ -0,0 +1,121 @@
+# coding=utf-8
+"""Unique values benchmark.
+
+Compares the original full feature scan of update_unique_values with the
+UniqueValueEngine on a local GeoPackage. Run it from a QGIS Python
+environment::
+
+    QT_QPA_PLATFORM=offscreen python3 test/benchmark_unique_values.py --rows 1000000
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'mygis@gis.my'
+__date__ = '2026-10-18'
+__copyright__ = 'Copyright 2026, GIS Innovation Sdn. Bhd.'
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from qgis.PyQt.QtCore import QMetaType
+from qgis.core import (
+    Qgis, QgsApplication, QgsCoordinateReferenceSystem, QgsCoordinateTransformContext,
+    QgsFeature, QgsField, QgsFields, QgsGeometry, QgsRectangle, QgsVectorFileWriter,
+    QgsVectorLayer,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unique_values import UniqueValueEngine  # noqa: E402
+
+BATCH_SIZE = 50000
+DISTRICT_COUNT = 60
+
+
+def create_parcels_geopackage(path, rows):
+    """Write a parcel-like polygon layer with a low and a high cardinality field."""
+    fields = QgsFields()
+    fields.append(QgsField("parcel_id", QMetaType.Type.Int))
+    fields.append(QgsField("district", QMetaType.Type.QString))
+    fields.append(QgsField("owner", QMetaType.Type.QString))
+
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = "GPKG"
+    options.layerName = "parcels"
+    writer = QgsVectorFileWriter.create(
+        path, fields, Qgis.WkbType.Polygon,
+        QgsCoordinateReferenceSystem("EPSG:3375"),
+        QgsCoordinateTransformContext(), options)
+
+    batch = []
+    for fid in range(rows):
+        x = (fid % 1000) * 30.0
+        y = (fid // 1000) * 30.0
+        feature = QgsFeature(fields)
+        feature.setGeometry(QgsGeometry.fromRect(QgsRectangle(x, y, x + 25.0, y + 25.0)))
+        feature.setAttributes([fid, f"District {fid % DISTRICT_COUNT}", f"Owner {fid // 3}"])
+        batch.append(feature)
+        if len(batch) == BATCH_SIZE:
+            writer.addFeatures(batch)
+            batch = []
+    if batch:
+        writer.addFeatures(batch)
+    del writer
+    return QgsVectorLayer(f"{path}|layername=parcels", "parcels", "ogr")
+
+
+def original_unique_values(layer, field_name):
+    """The full-geometry, all-attribute scan used before the engine existed."""
+    return set(str(f[field_name]) for f in layer.getFeatures() if f[field_name] is not None)
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--gpkg", help="Reuse or create the GeoPackage at this path")
+    args = parser.parse_args()
+
+    app = QgsApplication([], False)
+    app.initQgis()
+
+    path = args.gpkg or os.path.join(tempfile.mkdtemp(), "parcels.gpkg")
+    if os.path.exists(path):
+        layer = QgsVectorLayer(f"{path}|layername=parcels", "parcels", "ogr")
+    else:
+        print(f"Writing {args.rows} parcels to {path}")
+        layer = create_parcels_geopackage(path, args.rows)
+    print(f"Layer: {layer.featureCount()} features, provider {layer.dataProvider().name()}")
+
+    for field_name in ("district", "owner"):
+        engine = UniqueValueEngine(layer, field_name)
+        original_time, original = best_of(args.repeat, original_unique_values, layer, field_name)
+        provider_time, provider = best_of(args.repeat, engine.provider_values)
+        scan_time, scan = best_of(args.repeat, engine.scan_values)
+        assert original == provider == scan, f"Engine results differ for {field_name}"
+        print(f"{field_name}: {len(original)} values")
+        print(f"  original scan    {original_time:8.3f} s")
+        print(f"  provider DISTINCT {provider_time:7.3f} s  ({original_time / provider_time:6.1f}x)")
+        print(f"  NoGeometry scan  {scan_time:8.3f} s  ({original_time / scan_time:6.1f}x)")
+
+    app.exitQgis()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# coding=utf-8
+"""Facet navigator tests."""
+
+import random
+import unittest
+from array import array
+from collections import Counter
+
+from utilities import load_plugin_module
+
+facets = load_plugin_module("facets")
+
+FIELDS = {"district": 4, "landuse": 5, "owner": 6}  # Field name -> number of values
+ROWS = 300
+
+
+class FacetNavigatorTest(unittest.TestCase):
+    """Test the incremental violation counts against counting from scratch."""
+
+    def setUp(self):
+        generator = random.Random(7)
+        self.columns = facets.ColumnarCache(0)
+        self.columns.add_columns(array('q', range(1000, 1000 + ROWS)), {
+            name: (array('l', (generator.randrange(size) for _row in range(ROWS))),
+                   [f"{name} {code}" for code in range(size)])
+            for name, size in FIELDS.items()})
+        self.navigator = facets.FacetNavigator(self.columns)
+
+    def satisfies(self, row, skipped=None):
+        for name in self.navigator.facets():
+            selected = self.navigator.selected(name)
+            if name != skipped and selected is not None and self.columns.codes(name)[row] != selected:
+                return False
+        return True
+
+    def assert_consistent(self):
+        matching = [row for row in range(ROWS) if self.satisfies(row)]
+        self.assertEqual(self.navigator.matching_count, len(matching))
+        self.assertEqual(self.navigator.feature_ids(), [self.columns.feature_ids[row] for row in matching])
+        for name in self.navigator.facets():
+            expected = Counter(self.columns.codes(name)[row] for row in range(ROWS) if self.satisfies(row, name))
+            self.assertEqual(self.navigator.available(name), sum(expected.values()), name)
+            counted = {code: count for _label, code, count in self.navigator.counts(name) if count}
+            self.assertEqual(counted, dict(expected), name)
+
+    def test_pinned_facets_count_every_feature(self):
+        for name in FIELDS:
+            self.navigator.pin(name)
+        self.assert_consistent()
+        self.assertEqual(self.navigator.matching_count, ROWS)
+
+    def test_selections_keep_counts_consistent(self):
+        generator = random.Random(11)
+        for name in FIELDS:
+            self.navigator.pin(name)
+        for _step in range(60):
+            name = generator.choice(list(FIELDS))
+            code = generator.choice([None] + list(range(FIELDS[name])))
+            self.navigator.select(name, code)
+            self.assert_consistent()
+
+    def test_pin_and_unpin_under_selection(self):
+        self.navigator.pin("district")
+        self.navigator.select("district", 2)
+        self.navigator.pin("landuse")  # Counted among the features already restricted
+        self.assert_consistent()
+        self.navigator.select("landuse", 0)
+        self.navigator.pin("owner")
+        self.assert_consistent()
+        self.navigator.unpin("district")
+        self.assert_consistent()
+        self.assertFalse(self.navigator.is_pinned("district"))
+        self.navigator.unpin("landuse")
+        self.assert_consistent()
+        self.assertEqual(self.navigator.matching_count, ROWS)
+
+    def test_selected_value_is_listed_past_the_limit(self):
+        self.navigator.pin("owner")
+        self.navigator.select("owner", 5)
+        counts = self.navigator.counts("owner", limit=1)
+        self.assertIn(5, [code for _label, code, _count in counts])
+        self.assertEqual(counts[-1][0], "owner 5")
+
+
+if __name__ == "__main__":
+    unittest.main()
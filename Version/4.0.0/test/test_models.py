@@ -0,0 +1,103 @@
+# coding=utf-8
+"""Unique values model tests."""
+
+import unittest
+from array import array
+
+from utilities import load_plugin_module
+
+models = load_plugin_module("models")
+
+
+class UniqueValuesModelTest(unittest.TestCase):
+    """Test listing, streaming, filtering and finding values."""
+
+    VALUES = tuple(f"V{number:02d}" for number in range(0, 40, 2))  # V00, V02 ... V38
+
+    def setUp(self):
+        self.model = models.UniqueValuesModel()
+        self.model.set_values(self.VALUES)
+
+    def shown(self):
+        return [self.model.value(row) for row in range(self.model.rowCount())]
+
+    def test_sorted_tuple_is_shared(self):
+        self.assertIs(self.model.values(), self.VALUES)
+        self.assertEqual(self.shown(), list(self.VALUES))
+        self.assertIsNone(self.model.value(len(self.VALUES)))
+
+    def test_streamed_values_are_sorted_once(self):
+        self.model.clear()
+        self.model.append_values(["V04", "V00"])
+        self.model.append_values(["V02"])
+        self.assertEqual(self.shown(), ["V04", "V00", "V02"])  # In the order found until the scan ends
+        self.assertTrue(self.model.sort_values())
+        self.assertEqual(self.model.values(), ("V00", "V02", "V04"))
+        self.assertFalse(self.model.sort_values())
+
+    def test_find(self):
+        self.assertEqual(self.model.find("V10"), 5)
+        self.assertEqual(self.model.find("V11"), -1)
+
+    def test_filter_shows_given_positions(self):
+        self.model.set_filter(array('l', (1, 3, 10)))
+        self.assertEqual(self.shown(), ["V02", "V06", "V20"])
+        self.assertEqual(self.model.find("V06"), 1)
+        self.assertEqual(self.model.find("V04"), -1)  # Filtered out
+        self.model.set_filter(None)
+        self.assertEqual(len(self.shown()), len(self.VALUES))
+
+    def test_insert_and_remove_under_filter(self):
+        self.model.set_filter(array('l', (1, 3, 10)))  # V02, V06, V20
+        self.assertEqual(self.model.insert_value("V05"), 3)
+        self.assertEqual(self.shown(), ["V02", "V06", "V20"])  # New values stay hidden
+        self.assertEqual(self.model.remove_value("V06"), 4)
+        self.assertEqual(self.shown(), ["V02", "V20"])
+        self.assertEqual(self.model.remove_value("V10"), 5)  # Filtered out, still removed
+        self.assertEqual(self.shown(), ["V02", "V20"])
+        self.model.set_filter(None)
+        self.assertEqual(self.shown()[:6], ["V00", "V02", "V04", "V05", "V08", "V12"])
+
+
+class PagedUniqueValuesModelTest(unittest.TestCase):
+    """Test values shown page by page while values are inserted and removed."""
+
+    VALUES = UniqueValuesModelTest.VALUES
+
+    def setUp(self):
+        self.model = models.UniqueValuesModel()
+        self.model.set_page_size(5)
+        self.model.set_values(self.VALUES)
+
+    def shown(self):
+        return [self.model.value(row) for row in range(self.model.rowCount())]
+
+    def test_first_page_is_shown(self):
+        self.assertEqual(self.shown(), list(self.VALUES[:5]))
+        self.assertTrue(self.model.canFetchMore())
+        self.model.fetchMore()
+        self.assertEqual(self.shown(), list(self.VALUES[:10]))
+
+    def test_insert_within_loaded_pages(self):
+        self.assertEqual(self.model.insert_value("V03"), 2)
+        self.assertEqual(self.shown(), ["V00", "V02", "V03", "V04", "V06", "V08"])
+        self.assertEqual(self.model.insert_value("V03"), -1)  # Listed already
+
+    def test_insert_beyond_loaded_pages(self):
+        self.assertEqual(self.model.insert_value("V25"), 13)
+        self.assertEqual(self.shown(), list(self.VALUES[:5]))
+        self.assertEqual(self.model.values()[13], "V25")
+        self.assertEqual(self.model.find("V25"), 13)  # Loads the pages up to the value
+        self.assertEqual(self.model.rowCount(), 15)
+
+    def test_remove_within_and_beyond_loaded_pages(self):
+        self.assertEqual(self.model.remove_value("V04"), 2)
+        self.assertEqual(self.shown(), ["V00", "V02", "V06", "V08"])
+        self.assertEqual(self.model.remove_value("V30"), 14)
+        self.assertEqual(self.shown(), ["V00", "V02", "V06", "V08"])
+        self.assertEqual(self.model.remove_value("V99"), -1)
+        self.assertEqual(len(self.model.values()), len(self.VALUES) - 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
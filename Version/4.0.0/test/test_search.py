@@ -0,0 +1,102 @@
+# coding=utf-8
+"""Unique value search tests."""
+
+import unittest
+
+from utilities import load_plugin_module
+
+search = load_plugin_module("search")
+
+VALUES = tuple(sorted(
+    [f"Category {number}" for number in range(40)]
+    + ["Jalan Ampang", "Jalan Tun Razak", "Lebuhraya Utara", "Persiaran KLCC", "Taman Tun Dr Ismail"]))
+
+
+def linear_search(values, text):
+    query = text.lower()
+    return [position for position, value in enumerate(values) if query in value.lower()]
+
+
+class BoundedLevenshteinTest(unittest.TestCase):
+    """Test the edit distance with an upper bound."""
+
+    def test_distances_within_bound(self):
+        self.assertEqual(search.bounded_levenshtein("kitten", "sitting", 3), 3)
+        self.assertEqual(search.bounded_levenshtein("flaw", "lawn", 2), 2)
+        self.assertEqual(search.bounded_levenshtein("same", "same", 0), 0)
+        self.assertEqual(search.bounded_levenshtein("", "abc", 3), 3)
+
+    def test_distances_beyond_bound(self):
+        self.assertIsNone(search.bounded_levenshtein("kitten", "sitting", 2))
+        self.assertIsNone(search.bounded_levenshtein("a", "abcdef", 3))  # Length difference alone
+        self.assertIsNone(search.bounded_levenshtein("abcd", "wxyz", 3))
+
+    def test_similarity(self):
+        self.assertEqual(search.similarity("", ""), 1.0)
+        self.assertEqual(search.similarity("road", "road"), 1.0)
+        self.assertAlmostEqual(search.similarity("roads", "road"), 0.8)
+        self.assertEqual(search.similarity("road", "raod"), 0.0)  # Two edits, past a third of the length
+
+
+class ValueSearchEngineTest(unittest.TestCase):
+    """Test substring and fuzzy search over the listed values, with and without the trigram index."""
+
+    def setUp(self):
+        self.engine = search.ValueSearchEngine()
+        self.engine.set_values(VALUES)
+
+    def test_empty_query_shows_every_value(self):
+        self.assertIsNone(self.engine.search(""))
+
+    def test_search_matches_linear_scan(self):
+        for text in ("c", "CAT", "category 1", "tun", "xyz", "1"):
+            self.assertEqual(list(self.engine.search(text)), linear_search(VALUES, text), text)
+
+    def test_refined_query_matches_linear_scan(self):
+        for text in ("j", "ja", "jal", "jalan", "jalan t"):
+            self.assertEqual(list(self.engine.search(text)), linear_search(VALUES, text), text)
+
+    def test_indexed_search_matches_linear_scan(self):
+        keys = [search.normalize(value) for value in VALUES]
+        self.assertTrue(self.engine.set_index(self.engine.generation(), keys, search.TrigramIndex(keys)))
+        self.assertTrue(self.engine.has_index())
+        for text in ("ego", "category 3", "tun", "an ", "zzz"):
+            self.assertEqual(list(self.engine.search(text)), linear_search(VALUES, text), text)
+
+    def test_index_of_changed_values_is_rejected(self):
+        values = list(VALUES)
+        self.engine.set_values(values)
+        generation = self.engine.generation()
+        keys = [search.normalize(value) for value in values]
+        values.insert(0, "Aaa")  # Changed in place while the index was built
+        self.engine.value_inserted(values, 0)
+        self.assertFalse(self.engine.set_index(generation, keys, search.TrigramIndex(keys)))
+        self.assertFalse(self.engine.has_index())
+
+    def test_fuzzy_search_ranks_closest_value_first(self):
+        keys = [search.normalize(value) for value in VALUES]
+        self.engine.set_index(self.engine.generation(), keys, search.TrigramIndex(keys))
+        rows = self.engine.fuzzy_search("jalan tun razk")
+        self.assertEqual(VALUES[rows[0]], "Jalan Tun Razak")
+        rows = self.engine.fuzzy_search("persiaran")
+        self.assertEqual(VALUES[rows[0]], "Persiaran KLCC")  # Prefix matches rank first
+
+    def test_fuzzy_search_without_index_falls_back_to_substring(self):
+        self.assertEqual(list(self.engine.fuzzy_search("tun")), linear_search(VALUES, "tun"))
+
+    def test_inserted_and_removed_values_are_searched(self):
+        values = list(VALUES)
+        self.engine.set_values(values)
+        self.engine.search("jalan")
+        values.insert(0, "Jalan Ampang Hilir")
+        values.sort()
+        self.engine.value_inserted(values, values.index("Jalan Ampang Hilir"))
+        self.assertEqual(list(self.engine.search("jalan")), linear_search(values, "jalan"))
+        position = values.index("Jalan Tun Razak")
+        del values[position]
+        self.engine.value_removed(values, position)
+        self.assertEqual(list(self.engine.search("jalan")), linear_search(values, "jalan"))
+
+
+if __name__ == "__main__":
+    unittest.main()
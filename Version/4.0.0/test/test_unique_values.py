@@ -0,0 +1,139 @@
+# coding=utf-8
+"""Unique value engine tests."""
+
+import unittest
+
+from utilities import get_qgis_app, load_plugin_module
+
+get_qgis_app()  # Layers need a running QgsApplication
+
+from qgis.core import QgsFeature, QgsVectorLayer, QgsVectorLayerFeatureSource  # noqa: E402
+
+unique_values = load_plugin_module("unique_values")
+
+
+def create_layer(names):
+    layer = QgsVectorLayer("None?field=name:string", "values", "memory")
+    features = []
+    for name in names:
+        feature = QgsFeature(layer.fields())
+        feature.setAttributes([name])
+        features.append(feature)
+    layer.dataProvider().addFeatures(features)
+    return layer
+
+
+class ValueIndexTest(unittest.TestCase):
+    """Test the value to feature id index."""
+
+    def test_ids_per_value(self):
+        index = unique_values.UniqueValueEngine(create_layer(["a", "a", "b", None]), "name").build_index()
+        self.assertEqual(sorted(index.keys()), ["a", "b"])  # NULL is not listed
+        self.assertEqual(len(index.ids("a")), 2)
+        self.assertEqual(len(index.ids("a", first_only=True)), 1)
+        self.assertEqual(index.ids("z"), [])
+
+    def test_arrays_round_trip(self):
+        index = unique_values.ValueIndex()
+        for fid, key in enumerate(["x", "y", "x", "z", "x"]):
+            index.add(key, fid)
+        keys = ("x", "y", "z")
+        counts, ids = index.to_arrays(keys)
+        self.assertEqual(list(counts), [3, 1, 1])
+        restored = unique_values.ValueIndex.from_arrays(keys, counts, ids)
+        for key in keys:
+            self.assertEqual(list(restored.ids(key)), list(index.ids(key)))
+
+
+class CardinalityTest(unittest.TestCase):
+    """Test the unique value estimate and its sample."""
+
+    def test_small_layer_is_counted_exactly(self):
+        layer = create_layer(["a", "a", "b", None])
+        engine = unique_values.UniqueValueEngine(layer, "name")
+        estimate = engine.estimate_cardinality(100, QgsVectorLayerFeatureSource(layer), layer.featureCount())
+        self.assertEqual(estimate, (2, True))
+
+    def test_sample_spreads_over_clustered_rows(self):
+        layer = create_layer(["x"] * 500 + [f"v{number}" for number in range(500)])
+        engine = unique_values.UniqueValueEngine(layer, "name")
+        keys, complete = engine.sample_keys(QgsVectorLayerFeatureSource(layer), layer.featureCount(), 100)
+        self.assertFalse(complete)
+        self.assertEqual(len(keys), 100)
+        self.assertEqual(keys.count("x"), 50)  # The first 100 rows would all be "x"
+
+
+class ValueMultisetTest(unittest.TestCase):
+    """Test the reference counts followed through an edit session."""
+
+    def setUp(self):
+        self.layer = create_layer(["a", "a", "b", "c", None])
+        index = unique_values.UniqueValueEngine(self.layer, "name").build_index()
+        self.fids = {name: [feature.id() for feature in self.layer.getFeatures() if feature["name"] == name]
+                     for name in ("a", "b", "c")}
+        self.changes = []
+        self.layer.startEditing()
+        self.multiset = unique_values.ValueMultiset(
+            self.layer, "name", index, lambda appeared, disappeared: self.changes.append((appeared, disappeared)))
+
+    def tearDown(self):
+        self.multiset.release()
+        if self.layer.isEditable():
+            self.layer.rollBack()
+
+    def add_feature(self, name):
+        feature = QgsFeature(self.layer.fields())
+        feature.setAttributes([name])
+        self.assertTrue(self.layer.addFeature(feature))
+
+    def test_initial_counts(self):
+        self.assertEqual(self.multiset.counts, {"a": 2, "b": 1, "c": 1})
+
+    def test_changed_values_are_counted(self):
+        self.layer.changeAttributeValue(self.fids["b"][0], 0, "a")
+        self.assertEqual(self.multiset.counts, {"a": 3, "c": 1})
+        self.assertEqual(self.changes, [([], ["b"])])
+        self.layer.changeAttributeValue(self.fids["a"][0], 0, "d")
+        self.assertEqual(self.multiset.counts, {"a": 2, "c": 1, "d": 1})
+        self.assertEqual(self.changes[-1], (["d"], []))
+        self.layer.changeAttributeValue(self.fids["c"][0], 0, None)  # NULL is not listed
+        self.assertEqual(self.changes[-1], ([], ["c"]))
+
+    def test_added_and_deleted_features_are_counted(self):
+        self.add_feature("e")
+        self.add_feature("a")
+        self.assertEqual(self.multiset.counts, {"a": 3, "b": 1, "c": 1, "e": 1})
+        self.assertEqual(self.changes, [(["e"], [])])
+        self.layer.deleteFeature(self.fids["c"][0])
+        self.assertEqual(self.changes[-1], ([], ["c"]))
+        self.layer.deleteFeature(self.fids["a"][0])
+        self.assertEqual(self.multiset.counts, {"a": 2, "b": 1, "e": 1})
+
+    def test_rollback_restores_counts_from_the_journal(self):
+        self.layer.changeAttributeValue(self.fids["b"][0], 0, "c")
+        self.layer.deleteFeature(self.fids["a"][0])
+        self.layer.deleteFeature(self.fids["a"][1])
+        self.add_feature("e")
+        self.assertEqual(self.multiset.counts, {"c": 2, "e": 1})
+        self.changes = []
+        self.layer.rollBack()
+        self.assertEqual(self.multiset.counts, {"a": 2, "b": 1, "c": 1})
+        # One notification for the whole rollback, not one per undone edit
+        self.assertEqual(self.changes, [(["a", "b"], ["e"])])
+
+    def test_commit_keeps_counts_and_remaps_added_features(self):
+        self.add_feature("e")
+        self.assertTrue(self.layer.commitChanges())
+        self.assertEqual(self.multiset.counts, {"a": 2, "b": 1, "c": 1, "e": 1})
+        committed = [feature.id() for feature in self.layer.getFeatures() if feature["name"] == "e"]
+        self.layer.startEditing()
+        self.changes = []
+        self.layer.rollBack()  # Nothing was edited since the commit
+        self.assertEqual(self.changes, [])
+        self.layer.startEditing()
+        self.layer.deleteFeature(committed[0])  # Known by its datasource id
+        self.assertEqual(self.changes, [([], ["e"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# coding=utf-8
+"""Common functionality used by the benchmarks."""
+
+import importlib.util
+import os
+import sys
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_PACKAGE = "easyfeatureselection"
+
+QGIS_APP = None  # Static variable used to hold hand to running QGIS app
+CANVAS = None
+PARENT = None
+IFACE = None
+
+
+class QgisInterface:
+    """Just enough of QgisInterface for the dialog to run outside QGIS."""
+
+    def __init__(self, canvas, parent):
+        from qgis.gui import QgsMessageBar
+        self.canvas = canvas
+        self.parent = parent
+        self.active_layer = None
+        self.message_bar = QgsMessageBar(parent)
+
+    def mainWindow(self):
+        return self.parent
+
+    def mapCanvas(self):
+        return self.canvas
+
+    def messageBar(self):
+        return self.message_bar
+
+    def activeLayer(self):
+        return self.active_layer
+
+    def setActiveLayer(self, layer):
+        self.active_layer = layer
+        return True
+
+    def layerTreeView(self):
+        return None
+
+
+def get_qgis_app():
+    """Start one offscreen QGIS application to benchmark against.
+
+    :returns: Handle to QGIS app, canvas, iface and parent.
+    :rtype: (QgsApplication, CANVAS, IFACE, PARENT)
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from qgis.PyQt.QtCore import QSize
+    from qgis.PyQt.QtWidgets import QWidget
+    from qgis.core import QgsApplication
+    from qgis.gui import QgsMapCanvas
+    import qgis.utils
+
+    global QGIS_APP, CANVAS, PARENT, IFACE  # pylint: disable=W0603
+    if QGIS_APP is None:
+        QGIS_APP = QgsApplication(sys.argv, True)
+        QGIS_APP.initQgis()
+    if PARENT is None:
+        PARENT = QWidget()
+    if CANVAS is None:
+        CANVAS = QgsMapCanvas(PARENT)
+        CANVAS.resize(QSize(800, 600))
+    if IFACE is None:
+        IFACE = QgisInterface(CANVAS, PARENT)
+        # The dialog module reads qgis.utils.iface when it is imported
+        qgis.utils.iface = IFACE
+    return QGIS_APP, CANVAS, IFACE, PARENT
+
+
+def load_plugin_module(name):
+    """Import a plugin module; the versioned plugin folder is not a valid package name."""
+    if PLUGIN_PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PLUGIN_PACKAGE, os.path.join(PLUGIN_DIR, "__init__.py"),
+            submodule_search_locations=[PLUGIN_DIR])
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PLUGIN_PACKAGE] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
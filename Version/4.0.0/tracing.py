@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from inspect import Parameter, signature
+
+from qgis.core import QgsMessageLog, Qgis
+
+
+class Tracer:
+    """Timed spans of the dialog slots, kept in memory and dumpable as Chrome trace JSON.
+
+    Disabled by default. While disabled a traced slot costs one attribute
+    read on top of the call; nothing is timed or recorded. The dump opens
+    in chrome://tracing and in the Perfetto UI.
+    """
+
+    MAX_EVENTS = 100000  # Older spans are dropped first
+
+    def __init__(self):
+        self.enabled = False
+        self.log_spans = True
+        self._events = deque(maxlen=self.MAX_EVENTS)
+        self._depth = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def record(self, name, start_ns, duration_ns, args):
+        event = {
+            "name": name,
+            "cat": "easyfeatureselection",
+            "ph": "X",  # Complete event: start and duration
+            "ts": start_ns / 1000.0,
+            "dur": duration_ns / 1000.0,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        self._events.append(event)
+        if self.log_spans:
+            details = ", ".join(f"{key} {value}" for key, value in args.items())
+            indent = "  " * self._depth
+            QgsMessageLog.logMessage(
+                f"{indent}{name}: {duration_ns / 1e6:.1f} ms" + (f" ({details})" if details else ""),
+                "Easy Feature Selector", Qgis.MessageLevel.Info)
+
+    def events(self):
+        return list(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+    def dump(self, path):
+        """Write the recorded spans to path in the Chrome trace event format."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self._events), "displayTimeUnit": "ms"}, f)
+        return len(self._events)
+
+
+tracer = Tracer()
+
+
+def traced(func):
+    """Time a dialog slot as a span named after it.
+
+    The span arguments come from the _trace_args() method of the object,
+    when it has one. Extra positional arguments are dropped like Qt does
+    for slots taking fewer arguments than the signal sends, since the
+    wrapper hides the real signature from PyQt.
+    """
+    parameters = signature(func).parameters.values()
+    if any(parameter.kind == Parameter.VAR_POSITIONAL for parameter in parameters):
+        max_args = None
+    else:
+        max_args = sum(1 for parameter in parameters
+                       if parameter.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD))
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if max_args is not None and len(args) > max_args:
+            args = args[:max_args]
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        tracer._depth += 1
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            tracer._depth -= 1
+            trace_args = getattr(args[0], "_trace_args", None) if args else None
+            try:
+                span_args = trace_args() if trace_args is not None else {}
+            except RuntimeError:  # Layer deleted during the slot
+                span_args = {}
+            tracer.record(name, start, duration, span_args)
+
+    return wrapper
@@ -0,0 +1,666 @@
+import math
+import sys
+from array import array
+from collections import Counter, OrderedDict
+from functools import partial
+
+from qgis.PyQt.QtCore import pyqtSignal
+from qgis.core import (
+    QgsDataProvider, QgsExpression, QgsFeatureRequest, QgsMessageLog, QgsProviderRegistry, QgsTask,
+    QgsVectorLayerFeatureSource, Qgis,
+)
+
+
+# Providers whose uniqueValues() implementation answers from the datasource
+# itself (SELECT DISTINCT or an attribute index) instead of iterating features.
+NATIVE_DISTINCT_PROVIDERS = frozenset((
+    "ogr", "spatialite", "postgres", "mssql", "oracle", "hana",
+))
+
+
+def value_key(value):
+    """Return the string used to list and match a field value, or None to skip it."""
+    if value is None:
+        return None
+    return str(value)
+
+
+class ValueIndex:
+    """Map listed value strings to the ids of the features holding them.
+
+    A value held by a single feature stores the bare id; only repeated values
+    pay for an array('q') of ids.
+    """
+
+    def __init__(self):
+        self._ids = {}
+
+    def add(self, key, fid):
+        ids = self._ids.get(key)
+        if ids is None:
+            self._ids[key] = fid
+        elif isinstance(ids, int):
+            self._ids[key] = array('q', (ids, fid))
+        else:
+            ids.append(fid)
+
+    def ids(self, key, first_only=False):
+        """Return the feature ids holding the value, as a list."""
+        ids = self._ids.get(key)
+        if ids is None:
+            return []
+        if isinstance(ids, int):
+            return [ids]
+        return [ids[0]] if first_only else ids.tolist()
+
+    def keys(self):
+        return self._ids.keys()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def estimate_size(self):
+        """Approximate memory use in bytes, keys excluded."""
+        return sys.getsizeof(self._ids) + sum(sys.getsizeof(ids) for ids in self._ids.values())
+
+    def to_arrays(self, keys):
+        """Return (counts, ids): the number of ids of each key, in the order of keys, and all ids one key after the other."""
+        counts = array('q')
+        all_ids = array('q')
+        for key in keys:
+            ids = self._ids.get(key)
+            if ids is None:
+                counts.append(0)
+            elif isinstance(ids, int):
+                counts.append(1)
+                all_ids.append(ids)
+            else:
+                counts.append(len(ids))
+                all_ids.extend(ids)
+        return counts, all_ids
+
+    @classmethod
+    def from_arrays(cls, keys, counts, ids):
+        """Rebuild an index from the output of to_arrays()."""
+        index = cls()
+        store = index._ids
+        position = 0
+        for key, count in zip(keys, counts):
+            if count == 1:
+                store[key] = ids[position]
+            elif count:
+                store[key] = ids[position:position + count]
+            position += count
+        return index
+
+
+class UniqueValueEngine:
+    """Collect the distinct values of a layer field with the cheapest available query."""
+
+    PROVIDER = "provider"
+    SCAN = "scan"
+
+    # How the values are listed, chosen from estimate_cardinality() by listing()
+    FULL_LIST = "full"  # Every value, with the value index
+    PAGED_LIST = "paged"  # Every value, shown page by page, without the value index
+    SEARCH_ONLY = "search"  # Only the values matching the search text, queried on demand
+
+    def __init__(self, layer, field_name):
+        self.layer = layer
+        self.provider = layer.dataProvider()
+        self.field_name = field_name
+        self.field_index = layer.fields().indexOf(field_name)
+
+    def strategy(self):
+        """Return PROVIDER when the datasource can compute distinct values itself."""
+        if self.field_index < 0:
+            return self.SCAN
+        if self.provider is None or self.provider.name() not in NATIVE_DISTINCT_PROVIDERS:
+            return self.SCAN
+        # Expression and joined fields only exist on the layer, the provider cannot see them
+        if self.layer.fields().fieldOrigin(self.field_index) != Qgis.FieldOrigin.Provider:
+            return self.SCAN
+        # Uncommitted edits live in the layer's edit buffer, not in the datasource
+        if self.layer.isModified():
+            return self.SCAN
+        return self.PROVIDER
+
+    def scan_request(self):
+        """Feature request reading only the key field, without geometry."""
+        request = QgsFeatureRequest()
+        request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        request.setSubsetOfAttributes([self.field_index])
+        return request
+
+    def provider_values(self):
+        provider_index = self.layer.fields().fieldOriginIndex(self.field_index)
+        keys = (value_key(value) for value in self.provider.uniqueValues(provider_index))
+        return {key for key in keys if key is not None}
+
+    def provider_query(self):
+        """Return what open_provider_values() needs to ask the datasource from another thread."""
+        return (self.layer.providerType(), self.layer.source(), self.layer.subsetString(),
+                self.layer.fields().fieldOriginIndex(self.field_index))
+
+    @staticmethod
+    def open_provider_values(provider_key, uri, subset, provider_index):
+        """Return the distinct values from a provider opened by the calling thread, or None when it does not open.
+
+        The provider of the layer belongs to the main thread; one created
+        here is only used, and deleted, by the thread that created it.
+        """
+        provider = QgsProviderRegistry.instance().createProvider(
+            provider_key, uri, QgsDataProvider.ProviderOptions())
+        if provider is None or not provider.isValid():
+            return None
+        if provider.subsetString() != subset and not provider.setSubsetString(subset):
+            return None
+        keys = (value_key(value) for value in provider.uniqueValues(provider_index))
+        return {key for key in keys if key is not None}
+
+    def scan_values(self, source=None):
+        keys = set()
+        for feature in (source or self.layer).getFeatures(self.scan_request()):
+            key = value_key(feature[self.field_index])
+            if key is not None:
+                keys.add(key)
+        return keys
+
+    def sample_keys(self, source, total, sample_size):
+        """Return (listed strings of about sample_size features, whether every feature was read).
+
+        Feature ids of files and memory layers are dense, so every
+        total / sample_size-th id from the first one spreads the sample
+        over the whole layer, however its rows are ordered. When fewer than
+        half of those ids exist, e.g. for database keys, the first
+        sample_size features are read instead. Only source is read, so
+        this can run in a task.
+        """
+        request = self.scan_request()
+        if total <= sample_size:
+            keys = [value_key(feature[self.field_index]) for feature in source.getFeatures(request)]
+            return keys, True
+        request.setLimit(1)
+        first = next(source.getFeatures(request), None)
+        if first is None:
+            return [], True
+        stride = total / sample_size
+        request = self.scan_request()
+        request.setFilterFids(sorted({first.id() + int(i * stride) for i in range(sample_size)}))
+        keys = [value_key(feature[self.field_index]) for feature in source.getFeatures(request)]
+        if len(keys) >= sample_size // 2:
+            return keys, False
+        request = self.scan_request()
+        request.setLimit(sample_size)
+        keys = [value_key(feature[self.field_index]) for feature in source.getFeatures(request)]
+        return keys, len(keys) < sample_size  # The feature count was too high
+
+    def estimate_cardinality(self, sample_size, source, total):
+        """Return (estimated number of unique values, whether it is exact) from a sample of the features.
+
+        When most sampled values are distinct, the estimate comes from the
+        number of repeated pairs, about read² / 2n for n values; a sample
+        without repeats is taken as a key field. Otherwise the
+        Guaranteed-Error Estimator scales only the values seen once, since
+        values seen twice are likely to be frequent everywhere.
+        """
+        if self.field_index < 0:
+            return 0, True
+        keys, complete = self.sample_keys(source, total, sample_size)
+        counts = Counter(key for key in keys if key is not None)
+        read = len(keys)
+        if complete or read >= total:
+            return len(counts), True
+        distinct = len(counts)
+        if distinct > read // 2:
+            pairs = sum(count * (count - 1) // 2 for count in counts.values())
+            estimate = read * (read - 1) / (2 * pairs) if pairs else total
+        else:
+            seen_once = sum(1 for count in counts.values() if count == 1)
+            estimate = math.sqrt(total / read) * seen_once + distinct - seen_once
+        return int(min(total, max(distinct, estimate))), False
+
+    @classmethod
+    def listing(cls, estimate, paged_threshold, search_threshold):
+        """Return FULL_LIST, PAGED_LIST or SEARCH_ONLY for an estimated number of values; 0 disables a threshold."""
+        if search_threshold and estimate > search_threshold:
+            return cls.SEARCH_ONLY
+        if paged_threshold and estimate > paged_threshold:
+            return cls.PAGED_LIST
+        return cls.FULL_LIST
+
+    def search_request(self, text):
+        """Request for the features whose value contains text, ignoring case."""
+        pattern = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        request = QgsFeatureRequest(QgsExpression(
+            f"{QgsExpression.quotedColumnRef(self.field_name)} ILIKE {QgsExpression.quotedString(f'%{pattern}%')}"))
+        request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        request.setSubsetOfAttributes([self.field_index])
+        return request
+
+    def build_index(self, source=None):
+        """Scan the field once and return a ValueIndex, its keys are the unique values."""
+        index = ValueIndex()
+        if self.field_index < 0:
+            return index
+        for feature in (source or self.layer).getFeatures(self.scan_request()):
+            key = value_key(feature[self.field_index])
+            if key is not None:
+                index.add(key, feature.id())
+        return index
+
+
+class CardinalityTask(QgsTask):
+    """Estimate the number of unique values of a field in the background, before choosing how to list them."""
+
+    def __init__(self, layer, field_name, sample_size):
+        super().__init__(f"Estimating unique values of {field_name}", QgsTask.Flag.CanCancel)
+        self.engine = UniqueValueEngine(layer, field_name)
+        self.field_name = field_name
+        self.sample_size = sample_size
+        self.total = max(layer.featureCount(), 0)
+        self.estimate = None  # (estimated number of unique values, whether it is exact)
+        self.exception = None
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.setDependentLayers([layer])
+
+    def run(self):
+        try:
+            self.estimate = self.engine.estimate_cardinality(self.sample_size, self.source, self.total)
+        except Exception as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def finished(self, result):
+        if self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Estimating unique values of {self.field_name} failed: {self.exception}",
+                "Easy Feature Selector", Qgis.MessageLevel.Warning)
+
+
+class UniqueValueTask(QgsTask):
+    """Collect unique values in the background, streaming newly found values in batches.
+
+    The value index is filled during the same scan. When the provider lists
+    the distinct values itself, its single query runs first, through a
+    provider the task opens for itself, and only the index scan follows;
+    a provider that does not open falls back to the scan.
+    """
+
+    valuesFound = pyqtSignal(list)  # Sorted when indexing is already True
+
+    BATCH_SIZE = 5000  # Features read between two streamed batches
+
+    def __init__(self, layer, field_name, build_index=True):
+        super().__init__(f"Collecting unique values of {field_name}", QgsTask.Flag.CanCancel)
+        engine = UniqueValueEngine(layer, field_name)
+        self.field_name = field_name
+        self.field_index = engine.field_index
+        self.request = engine.scan_request()
+        self.total = max(layer.featureCount(), 0)
+        self.values = set()
+        self.index = ValueIndex() if build_index else None
+        self.indexing = False  # True once all values are listed and only the index is being built
+        self.size = 0
+        self.exception = None
+        self.provider_query = engine.provider_query() if engine.strategy() == UniqueValueEngine.PROVIDER else None
+        # Feature sources are safe to iterate outside the main thread, the layer itself is not
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.setDependentLayers([layer])
+
+    def run(self):
+        try:
+            if self.provider_query is not None and not self.isCanceled():
+                values = UniqueValueEngine.open_provider_values(*self.provider_query)
+                if values is not None:
+                    self.values = values
+                    self.indexing = True
+                    if values:
+                        self.valuesFound.emit(sorted(values))
+            if self.index is not None or not self.indexing:
+                self._scan()
+            self.size = UniqueValueCache.estimate_size(self.values)
+            if self.index is not None:
+                self.size += self.index.estimate_size()
+        except Exception as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def _scan(self):
+        field_index = self.field_index
+        index = self.index
+        values = self.values
+        batch = []
+        for count, feature in enumerate(self.source.getFeatures(self.request), start=1):
+            key = value_key(feature[field_index])
+            if key is not None:
+                if not self.indexing and key not in values:
+                    values.add(key)
+                    batch.append(key)
+                if index is not None:
+                    index.add(key, feature.id())
+            if count % self.BATCH_SIZE == 0:
+                if self.isCanceled():
+                    return
+                if self.total:
+                    self.setProgress(min(100.0, 100.0 * count / self.total))
+                if batch:
+                    self.valuesFound.emit(batch)
+                    batch = []
+        if batch and not self.isCanceled():
+            self.valuesFound.emit(batch)
+
+    def finished(self, result):
+        if self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Collecting unique values of {self.field_name} failed: {self.exception}",
+                "Easy Feature Selector", Qgis.MessageLevel.Warning)
+
+
+class ValueSearchTask(QgsTask):
+    """List the values containing a search text, for fields with too many values to list them all."""
+
+    def __init__(self, layer, field_name, text, limit):
+        super().__init__(f"Searching {field_name} for {text}", QgsTask.Flag.CanCancel)
+        engine = UniqueValueEngine(layer, field_name)
+        self.field_name = field_name
+        self.field_index = engine.field_index
+        self.text = text
+        self.limit = limit
+        self.values = None
+        self.complete = True  # False when the limit stopped the search
+        self.exception = None
+        self.request = engine.search_request(text)
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.setDependentLayers([layer])
+
+    def run(self):
+        try:
+            values = set()
+            for read, feature in enumerate(self.source.getFeatures(self.request), start=1):
+                if read % 1000 == 0 and self.isCanceled():
+                    return False
+                key = value_key(feature[self.field_index])
+                if key is not None:
+                    values.add(key)
+                    if len(values) >= self.limit:
+                        self.complete = False
+                        break
+            self.values = tuple(sorted(values))
+        except Exception as e:  # Reported from finished() on the main thread
+            self.exception = e
+            return False
+        return not self.isCanceled()
+
+    def finished(self, result):
+        if self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Searching {self.field_name} for {self.text} failed: {self.exception}",
+                "Easy Feature Selector", Qgis.MessageLevel.Warning)
+
+
+class ValueMultiset:
+    """Reference counts of the listed values of one field, kept current while the layer is edited.
+
+    Built from a ValueIndex of the layer as it is when editing starts, it
+    follows attributeValueChanged, featureAdded and featureDeleted, so the
+    listed values never need another scan. Every change since editing
+    started or the last commit is journaled and undone on rollback.
+    changed(appeared, disappeared) receives the keys that gained their
+    first feature and those that lost their last one.
+    """
+
+    def __init__(self, layer, field_name, index, changed):
+        self.layer = layer
+        self.field_name = field_name
+        self.changed = changed
+        self.counts = {}  # Key -> number of features holding it
+        self._keys = {}  # Feature id -> key, NULL attributes are not listed
+        self._journal = []  # (feature id, previous key) in edit order
+        self._rolling_back = False  # Signals sent while QGIS undoes the edits are replaced by the journal
+        for key in index.keys():
+            feature_ids = index.ids(key)
+            self.counts[key] = len(feature_ids)
+            for feature_id in feature_ids:
+                self._keys[feature_id] = key
+        self._connections = [
+            (layer.attributeValueChanged, self._on_attribute_value_changed),
+            (layer.featureAdded, self._on_feature_added),
+            (layer.featureDeleted, self._on_feature_deleted),
+            (layer.beforeRollBack, self._on_before_roll_back),
+            (layer.afterRollBack, self.rollback),
+            (layer.committedFeaturesAdded, self._on_committed_features_added),
+            (layer.afterCommitChanges, self._on_after_commit_changes),
+        ]
+        for signal, slot in self._connections:
+            signal.connect(slot)
+
+    def keys(self):
+        return self.counts.keys()
+
+    def release(self):
+        """Disconnect from the layer once the multiset is dropped."""
+        for signal, slot in self._connections:
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        self._connections = []
+
+    def rollback(self):
+        """Restore the counts of the last commit, or of the start of editing."""
+        self._rolling_back = False
+        if not self._journal:
+            return
+        touched = set(self._keys.get(feature_id) for feature_id, _previous in self._journal)
+        touched.update(previous for _feature_id, previous in self._journal)
+        touched.discard(None)
+        before = {key for key in touched if key in self.counts}
+        for feature_id, previous in reversed(self._journal):
+            self._assign(feature_id, previous)
+        self._journal = []
+        after = {key for key in touched if key in self.counts}
+        self._notify(sorted(after - before), sorted(before - after))
+
+    def _field_index(self):
+        return self.layer.fields().indexOf(self.field_name)
+
+    def _set(self, feature_id, key):
+        if self._rolling_back:
+            return
+        previous = self._keys.get(feature_id)
+        if previous == key:
+            return
+        self._journal.append((feature_id, previous))
+        appeared, disappeared = self._assign(feature_id, key)
+        self._notify(appeared, disappeared)
+
+    def _assign(self, feature_id, key):
+        """Move feature_id to key, None removes it; return the keys that appeared and disappeared."""
+        appeared = []
+        disappeared = []
+        previous = self._keys.pop(feature_id, None)
+        if previous is not None:
+            count = self.counts[previous] - 1
+            if count:
+                self.counts[previous] = count
+            else:
+                del self.counts[previous]
+                disappeared.append(previous)
+        if key is not None:
+            self._keys[feature_id] = key
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+            if count == 1:
+                appeared.append(key)
+        return appeared, disappeared
+
+    def _notify(self, appeared, disappeared):
+        if appeared or disappeared:
+            self.changed(appeared, disappeared)
+
+    def _on_attribute_value_changed(self, feature_id, field_index, value):
+        if field_index == self._field_index():
+            self._set(feature_id, value_key(value))
+
+    def _on_feature_added(self, feature_id):
+        field_index = self._field_index()
+        if field_index < 0:
+            return
+        request = QgsFeatureRequest(feature_id)
+        request.setFlags(Qgis.FeatureRequestFlag.NoGeometry)
+        request.setSubsetOfAttributes([field_index])
+        feature = next(self.layer.getFeatures(request), None)
+        if feature is not None:
+            self._set(feature_id, value_key(feature[field_index]))
+
+    def _on_feature_deleted(self, feature_id):
+        self._set(feature_id, None)
+
+    def _on_before_roll_back(self):
+        self._rolling_back = True
+
+    def _on_committed_features_added(self, _layer_id, features):
+        """Added features get their datasource ids on commit, their values do not change."""
+        field_index = self._field_index()
+        for feature_id in [feature_id for feature_id in self._keys if feature_id < 0]:
+            del self._keys[feature_id]
+        for feature in features:
+            key = value_key(feature[field_index]) if field_index >= 0 else None
+            if key is not None:
+                self._keys[feature.id()] = key
+
+    def _on_after_commit_changes(self):
+        self._journal = []
+
+
+class UniqueValueCache:
+    """LRU cache of sorted unique values and their ValueIndex, keyed by (layer id, field name, subset string).
+
+    Entries are dropped as soon as the layer reports a change that can affect
+    them, so a hit never returns stale values.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (values, index, size in bytes)
+        self._size = 0
+        self._generations = {}  # layer id -> change counter, see generation()
+        self._watched = {}  # layer id -> (layer, [(signal, slot)])
+
+    @staticmethod
+    def key(layer, field_name):
+        return (layer.id(), field_name, layer.subsetString())
+
+    @staticmethod
+    def estimate_size(values):
+        return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+
+    def generation(self, layer):
+        """Change counter of the layer; pass it back to put() to reject values computed before a change."""
+        self._watch(layer)
+        return self._generations.get(layer.id(), 0)
+
+    def get(self, layer, field_name):
+        """Return the cached (sorted values tuple, ValueIndex or None), or None."""
+        key = self.key(layer, field_name)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, layer, field_name, values, generation=None, index=None, size=None):
+        """Store the values of a field, evicting least recently used entries over the budget.
+
+        A tuple is taken as already sorted and shared, other iterables are sorted.
+        """
+        if generation is not None and generation != self.generation(layer):
+            return
+        if not isinstance(values, tuple):
+            values = tuple(sorted(values))
+        if size is None:
+            size = self.estimate_size(values) + (index.estimate_size() if index is not None else 0)
+        if size > self.max_bytes:
+            return
+        key = self.key(layer, field_name)
+        self._discard(key)
+        self._entries[key] = (values, index, size)
+        self._size += size
+        self._watch(layer)
+        self._evict()
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats_text(self):
+        return (f"Unique value cache: {self.hits} hits, {self.misses} misses "
+                f"({self.hit_ratio():.0%} hit ratio), {len(self._entries)} entries, "
+                f"{self._size / 1048576:.1f} of {self.max_bytes / 1048576:.0f} MB")
+
+    def invalidate_layer(self, layer_id):
+        self._generations[layer_id] = self._generations.get(layer_id, 0) + 1
+        for key in [key for key in self._entries if key[0] == layer_id]:
+            self._discard(key)
+
+    def invalidate_field(self, layer_id, field_name):
+        self._generations[layer_id] = self._generations.get(layer_id, 0) + 1
+        for key in [key for key in self._entries if key[0] == layer_id and key[1] == field_name]:
+            self._discard(key)
+
+    def clear(self):
+        for layer_id in list(self._watched):
+            self._unwatch(layer_id)
+        self._entries.clear()
+        self._size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _key, (_values, _index, size) = self._entries.popitem(last=False)
+            self._size -= size
+
+    def _watch(self, layer):
+        layer_id = layer.id()
+        if layer_id in self._watched:
+            return
+        connections = [
+            (layer.attributeValueChanged, partial(self._on_attribute_value_changed, layer)),
+            (layer.featureAdded, partial(self._on_layer_changed, layer_id)),
+            (layer.featuresDeleted, partial(self._on_layer_changed, layer_id)),
+            (layer.subsetStringChanged, partial(self._on_layer_changed, layer_id)),
+            (layer.dataChanged, partial(self._on_layer_changed, layer_id)),
+            (layer.willBeDeleted, partial(self._on_layer_deleted, layer_id)),
+        ]
+        for signal, slot in connections:
+            signal.connect(slot)
+        self._watched[layer_id] = (layer, connections)
+
+    def _unwatch(self, layer_id):
+        _layer, connections = self._watched.pop(layer_id, (None, []))
+        for signal, slot in connections:
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+
+    def _on_attribute_value_changed(self, layer, _fid, field_index, _value):
+        self.invalidate_field(layer.id(), layer.fields().at(field_index).name())
+
+    def _on_layer_changed(self, layer_id, *_args):
+        self.invalidate_layer(layer_id)
+
+    def _on_layer_deleted(self, layer_id):
+        self.invalidate_layer(layer_id)
+        self._unwatch(layer_id)